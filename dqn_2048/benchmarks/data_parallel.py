@@ -0,0 +1,79 @@
+"""
+Data-parallel learner benchmark.
+Measures learning throughput for several numbers of local workers,
+each count in a fresh process since devices are configured once per process.
+Usage: python -m benchmarks.data_parallel [--workers 1 2 4 8] [--fit-batch-size 5000]
+"""
+
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser, SUPPRESS
+from time import perf_counter
+
+from config import BATCH_SIZE, BOARD_SIZE
+
+def run(workers_count: int, fit_batch_size: int, updates_count: int) -> dict:
+    """
+    Learns random batches of `BATCH_SIZE` experiences.
+    # Arguments
+        workers_count: int. The number of workers.
+        fit_batch_size: int. Size of the gradient steps.
+        updates_count: int. The number of measured `fit` calls.
+    # Returns the measured throughput.
+    """
+    import numpy as np # pylint: disable=import-outside-toplevel
+    from model import create_quality_builder # pylint: disable=import-outside-toplevel
+    quality = create_quality_builder(workers_count).set_fit_batch_size(fit_batch_size).build()
+    random = np.random.default_rng(0)
+    actions = random.integers(quality.output_size, size=BATCH_SIZE)
+    masks = np.zeros((BATCH_SIZE, quality.output_size))
+    masks[np.arange(BATCH_SIZE), actions] = 1.0
+    prepared_batch = (
+        random.random((BATCH_SIZE, BOARD_SIZE ** 2)),
+        masks * random.random((BATCH_SIZE, 1)),
+        masks,
+        random.random(BATCH_SIZE),
+    )
+    quality.fit(prepared_batch) # Warm up, traces the training function
+    started = perf_counter()
+    for _ in range(updates_count):
+        quality.fit(prepared_batch)
+    elapsed = perf_counter() - started
+    return {
+        "workers": workers_count,
+        "updates_per_second": updates_count / elapsed,
+        "samples_per_second": updates_count * BATCH_SIZE / elapsed,
+    }
+
+def main():
+    parser = ArgumentParser(description="Data-parallel learner throughput per worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--fit-batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--run", type=int, default=None, help=SUPPRESS)
+    args = parser.parse_args()
+    if args.run is not None:
+        print(json.dumps(run(args.run, args.fit_batch_size, args.updates)))
+        return
+    print(f"{'workers':>7} {'updates/s':>10} {'samples/s':>12} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    for workers_count in args.workers:
+        output = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.data_parallel", "--run", str(workers_count),
+                "--fit-batch-size", str(args.fit_batch_size), "--updates", str(args.updates)
+            ],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        baseline = baseline or result["samples_per_second"]
+        speedup = result["samples_per_second"] / baseline
+        print(
+            f"{workers_count:>7} {result['updates_per_second']:>10.2f} "
+            f"{result['samples_per_second']:>12,.0f} {speedup:>7.2f}x "
+            f"{speedup / workers_count * args.workers[0]:>9.0%}"
+        )
+
+if __name__ == "__main__":
+    main()
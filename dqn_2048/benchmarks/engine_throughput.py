@@ -0,0 +1,61 @@
+"""
+Engine throughput benchmark.
+Compares the moves per second of the list-based `State` and of the vectorized `Engine`
+for several board sizes, playing random moves.
+Usage: python -m benchmarks.engine_throughput [sizes...]
+"""
+
+from random import randrange
+from sys import argv
+from time import perf_counter
+
+import numpy as np
+
+from config import BOARD_UNIT
+from game import Direction, State, Engine
+from game.base import Action
+
+STATE_MOVES_COUNT = 20000
+ENGINE_BOARDS_COUNT = 4096
+ENGINE_STEPS_COUNT = 100
+
+def measure_state(size: int) -> float:
+    """
+    # Arguments
+        size: int. The size of the board.
+    # Returns moves per second of the list-based state.
+    """
+    state = State(size=size, unit=BOARD_UNIT)
+    state.reset()
+    started = perf_counter()
+    for _ in range(STATE_MOVES_COUNT):
+        if state.is_ended():
+            state.reset()
+        state.executed(Action(randrange(len(Direction))))
+    return STATE_MOVES_COUNT / (perf_counter() - started)
+
+def measure_engine(size: int) -> float:
+    """
+    # Arguments
+        size: int. The size of the boards.
+    # Returns moves per second of the vectorized engine.
+    """
+    engine = Engine(size, BOARD_UNIT, ENGINE_BOARDS_COUNT, seed=0)
+    random = np.random.default_rng(0)
+    started = perf_counter()
+    for _ in range(ENGINE_STEPS_COUNT):
+        engine.executed(random.integers(len(Direction), size=ENGINE_BOARDS_COUNT))
+        engine.reset(np.flatnonzero(engine.is_ended()))
+    return ENGINE_BOARDS_COUNT * ENGINE_STEPS_COUNT / (perf_counter() - started)
+
+def main():
+    sizes = [int(size) for size in argv[1:]] or [4, 5, 6]
+    print(f"{'size':>4} {'State moves/s':>15} {'Engine moves/s':>15} {'speedup':>8}")
+    for size in sizes:
+        state_rate = measure_state(size)
+        engine_rate = measure_engine(size)
+        speedup = engine_rate / state_rate
+        print(f"{size:>4} {state_rate:>15,.0f} {engine_rate:>15,.0f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Import time benchmark.
+Checks that the environment side of the game can be imported without TensorFlow
+and reports how long each import takes in a fresh interpreter.
+Usage: python -m benchmarks.import_time [repeats]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from sys import argv
+from typing import Tuple
+
+CURRENT_PATH = Path(__file__).parent.parent
+
+# Each snippet is run in a fresh interpreter
+IMPORTS = {
+    "environment": "from game import State, StateBuilder, Environment, Direction",
+    "agent": "from game import QualityBuilder, Agent",
+    "quality": "from game import Quality",
+}
+
+# Environment-only imports must stay below this budget (seconds)
+ENVIRONMENT_BUDGET = 0.5
+
+_SNIPPET = """
+import sys
+from time import perf_counter
+start = perf_counter()
+{statement}
+elapsed = perf_counter() - start
+print(elapsed, "tensorflow" in sys.modules)
+"""
+
+def measure(statement: str) -> Tuple[float, bool]:
+    """
+    # Arguments
+        statement: str. Import statement to be measured.
+    # Returns the import time in seconds and whether TensorFlow has been loaded.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _SNIPPET.format(statement=statement)],
+        cwd=CURRENT_PATH, check=True, capture_output=True, text=True
+    ).stdout.split()
+    return (float(output[0]), output[1] == "True")
+
+def main():
+    repeats = int(argv[1]) if len(argv) > 1 else 5
+    is_passed = True
+    for name, statement in IMPORTS.items():
+        try:
+            results = [measure(statement) for _ in range(repeats)]
+        except subprocess.CalledProcessError as error:
+            print(f"{name:12} FAILED\n{error.stderr}")
+            is_passed = is_passed and name != "environment"
+            continue
+        elapsed = median(r[0] for r in results)
+        is_tf_loaded = any(r[1] for r in results)
+        print(f"{name:12} {elapsed * 1000:9.1f} ms  tensorflow loaded: {is_tf_loaded}")
+        if name == "environment" and (is_tf_loaded or elapsed > ENVIRONMENT_BUDGET):
+            is_passed = False
+    if not is_passed:
+        print("Environment-only imports are not standalone or too slow")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Micro-batching benchmark.
+Checks that accumulating the gradients of micro-batches gives the same updates as whole gradient
+steps, then measures the speed and the peak memory for several micro-batch sizes,
+each size in a fresh process since the peak memory of a process never goes down.
+Usage: python -m benchmarks.micro_batching [--sizes 0 2500 500 100] [--fit-batch-size 5000]
+"""
+
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser, SUPPRESS
+from time import perf_counter
+from typing import List, Tuple
+
+from config import BATCH_SIZE, BOARD_SIZE
+
+def create_batch(output_size: int) -> Tuple:
+    """
+    # Arguments
+        output_size: int. Output size of the model.
+    # Returns a random prepared batch of `BATCH_SIZE` experiences.
+    """
+    import numpy as np # pylint: disable=import-outside-toplevel
+    random = np.random.default_rng(0)
+    actions = random.integers(output_size, size=BATCH_SIZE)
+    masks = np.zeros((BATCH_SIZE, output_size))
+    masks[np.arange(BATCH_SIZE), actions] = 1.0
+    return (
+        random.random((BATCH_SIZE, BOARD_SIZE ** 2)),
+        masks * random.random((BATCH_SIZE, 1)),
+        masks,
+        random.random(BATCH_SIZE),
+    )
+
+def relative_difference(weights: List, other_weights: List, initial_weights: List) -> float:
+    """
+    # Arguments
+        weights: List. Weights learned whole.
+        other_weights: List. Weights learned in micro-batches.
+        initial_weights: List. Weights both were learned from.
+    # Returns the largest difference of weights, relative to the largest change of the weights
+        (not to the weights themselves, since biases start at zero).
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    difference = max(float(np.max(np.abs(w - o))) for w, o in zip(weights, other_weights))
+    change = max(float(np.max(np.abs(w - i))) for w, i in zip(weights, initial_weights))
+    return difference / change
+
+def compare(micro_batch_size: int, fit_batch_size: int, updates_count: int) -> dict:
+    """
+    Learns the same batch from the same weights, with and without micro-batching.
+    # Arguments
+        micro_batch_size: int. Size of the micro-batches.
+        fit_batch_size: int. Size of the gradient steps.
+        updates_count: int. The number of compared `fit` calls.
+    # Returns the largest relative difference of losses,
+        and the relative differences of weights after the first update and after all of them.
+    """
+    from model import create_quality_builder # pylint: disable=import-outside-toplevel
+    quality = create_quality_builder().set_fit_batch_size(fit_batch_size).build()
+    micro_batched_quality = create_quality_builder() \
+        .set_fit_batch_size(fit_batch_size) \
+        .set_micro_batch_size(micro_batch_size) \
+        .build()
+    initial_weights = quality.snapshot()
+    micro_batched_quality.restored(initial_weights)
+    prepared_batch = create_batch(quality.output_size)
+    loss_difference = 0.0
+    for update in range(updates_count):
+        loss = quality.fit(prepared_batch)
+        micro_batched_loss = micro_batched_quality.fit(prepared_batch)
+        loss_difference = max(loss_difference, abs(loss - micro_batched_loss) / abs(loss))
+        if update == 0:
+            update_difference = relative_difference(
+                quality.weights, micro_batched_quality.weights, initial_weights
+            )
+    weight_difference = relative_difference(
+        quality.weights, micro_batched_quality.weights, initial_weights
+    )
+    return {"loss": loss_difference, "update": update_difference, "weights": weight_difference}
+
+def run(micro_batch_size: int, fit_batch_size: int, updates_count: int) -> dict:
+    """
+    # Arguments
+        micro_batch_size: int. Size of the micro-batches, `0` for whole gradient steps.
+        fit_batch_size: int. Size of the gradient steps.
+        updates_count: int. The number of measured `fit` calls.
+    # Returns the measured throughput and peak memory.
+    """
+    from game.base import process_memory # pylint: disable=import-outside-toplevel
+    from model import create_quality_builder # pylint: disable=import-outside-toplevel
+    quality = create_quality_builder() \
+        .set_fit_batch_size(fit_batch_size) \
+        .set_micro_batch_size(micro_batch_size or None) \
+        .build()
+    prepared_batch = create_batch(quality.output_size)
+    quality.fit(prepared_batch) # Warm up, traces the training function
+    started = perf_counter()
+    for _ in range(updates_count):
+        quality.fit(prepared_batch)
+    elapsed = perf_counter() - started
+    return {
+        "micro_batch_size": micro_batch_size,
+        "updates_per_second": updates_count / elapsed,
+        "peak_rss": process_memory()["peak_rss"],
+        "step_activations": quality.memory()["step_activations"],
+    }
+
+def main():
+    parser = ArgumentParser(description="Micro-batched gradient steps: agreement, speed, memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 2500, 500, 100],
+                        help="Micro-batch sizes, 0 for whole gradient steps")
+    parser.add_argument("--fit-batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--updates", type=int, default=10)
+    parser.add_argument("--run", type=int, default=None, help=SUPPRESS)
+    args = parser.parse_args()
+    if args.run is not None:
+        print(json.dumps(run(args.run, args.fit_batch_size, args.updates)))
+        return
+    micro_batch_size = min(size for size in args.sizes if size > 0)
+    differences = compare(micro_batch_size, args.fit_batch_size, args.updates)
+    print(
+        f"Micro-batches of {micro_batch_size}, relative differences: "
+        f"loss {differences['loss']:.2e}, first update {differences['update']:.2e}, "
+        f"weights after {args.updates} updates {differences['weights']:.2e}"
+    )
+    print(f"{'micro':>7} {'updates/s':>10} {'activations':>12} {'peak RSS':>10}")
+    for size in args.sizes:
+        output = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.micro_batching", "--run", str(size),
+                "--fit-batch-size", str(args.fit_batch_size), "--updates", str(args.updates)
+            ],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{size or 'off':>7} {result['updates_per_second']:>10.2f} "
+            f"{result['step_activations'] / 2 ** 20:>10.1f}MB "
+            f"{result['peak_rss'] / 2 ** 20:>8.0f}MB"
+        )
+
+if __name__ == "__main__":
+    main()
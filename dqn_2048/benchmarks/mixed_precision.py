@@ -0,0 +1,122 @@
+"""
+Mixed-precision benchmark.
+Compares precision policies of the dense model on the same data: learning throughput,
+then a learning curve on the random-play transitions of the warmup and the score of the result,
+each policy in a fresh process since TensorFlow configures its devices once per process.
+Usage: python -m benchmarks.mixed_precision [--precisions float32 mixed_bfloat16] [--updates 2000]
+"""
+
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser, SUPPRESS
+from time import perf_counter
+
+from config import (
+    CURRENT_PATH, BATCH_SIZE, BOARD_SIZE, BOARD_UNIT, WARMUP_PATH, WARMUP_SEED,
+    TARGET_SYNCING_FREQUENCY
+)
+
+def run(precision: str, updates_count: int, points_count: int, games_count: int) -> dict:
+    """
+    # Arguments
+        precision: str. Precision policy of the model.
+        updates_count: int. The number of updates of the learning curve.
+        points_count: int. The number of points of the learning curve.
+        games_count: int. The number of greedy games scored after learning.
+    # Returns the throughput, the learning curve and the final scores.
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    import tensorflow as tf
+    from game import StateBuilder, Warmup
+    from game.base import Evaluator, Experience, RunningAggregate
+    from model import create_quality_builder
+    quality_builder = create_quality_builder().set_precision(precision)
+    random = np.random.default_rng(0)
+
+    # Throughput, on random prepared batches
+    quality = quality_builder.build()
+    actions = random.integers(quality.output_size, size=BATCH_SIZE)
+    masks = np.zeros((BATCH_SIZE, quality.output_size))
+    masks[np.arange(BATCH_SIZE), actions] = 1.0
+    prepared_batch = (
+        random.random((BATCH_SIZE, BOARD_SIZE ** 2)),
+        masks * random.random((BATCH_SIZE, 1)),
+        masks,
+        random.random(BATCH_SIZE),
+    )
+    quality.fit(prepared_batch) # Warm up, traces the training function
+    started = perf_counter()
+    for _ in range(10):
+        quality.fit(prepared_batch)
+    updates_per_second = 10 / (perf_counter() - started)
+
+    # Learning curve, from the same weights on the same batches for every precision
+    tf.random.set_seed(0)
+    training_quality = quality_builder.build()
+    target_quality = quality_builder.build()
+    warmup_path = WARMUP_PATH or CURRENT_PATH / "warmup"
+    warmup = Warmup(str(warmup_path), BOARD_SIZE, BOARD_UNIT, WARMUP_SEED)
+    transitions = warmup.transitions(20 * BATCH_SIZE)
+    curve = []
+    losses = RunningAggregate()
+    for update in range(updates_count):
+        if update % TARGET_SYNCING_FREQUENCY == 0:
+            target_quality.copied(training_quality)
+        sampled = [transitions[i] for i in random.choice(len(transitions), BATCH_SIZE)]
+        values = target_quality.calculate(sampled)
+        batch = [Experience(t.old_state, t.action, v) for t, v in zip(sampled, values)]
+        losses.add(training_quality.learn(batch))
+        if (update + 1) % max(1, updates_count // points_count) == 0:
+            curve.append({"updates": update + 1, "loss": losses.mean})
+            losses = RunningAggregate()
+
+    state_builder = StateBuilder().set_size(BOARD_SIZE).set_unit(BOARD_UNIT)
+    games = Evaluator(training_quality, state_builder, 64).play(games_count)
+    return {
+        "precision": precision,
+        "updates_per_second": updates_per_second,
+        "curve": curve,
+        "score": float(np.mean([state.score for state, _, _ in games])),
+        "max_tile": float(np.median([state.max_tile for state, _, _ in games])),
+    }
+
+def main():
+    parser = ArgumentParser(description="Mixed-precision throughput and learning curves")
+    parser.add_argument("--precisions", nargs="+",
+                        default=["float32", "mixed_bfloat16", "mixed_float16"])
+    parser.add_argument("--updates", type=int, default=2000, help="Updates of the curves")
+    parser.add_argument("--points", type=int, default=10, help="Points of the curves")
+    parser.add_argument("--games", type=int, default=100, help="Games scored after learning")
+    parser.add_argument("--run", default=None, help=SUPPRESS)
+    args = parser.parse_args()
+    if args.run is not None:
+        print(json.dumps(run(args.run, args.updates, args.points, args.games)))
+        return
+    results = []
+    for precision in args.precisions:
+        output = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.mixed_precision", "--run", precision,
+                "--updates", str(args.updates), "--points", str(args.points),
+                "--games", str(args.games)
+            ],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    baseline = results[0]["updates_per_second"]
+    print(f"{'precision':>15} {'updates/s':>10} {'speedup':>8} {'score':>9} {'max tile':>9}")
+    for result in results:
+        print(
+            f"{result['precision']:>15} {result['updates_per_second']:>10.2f} "
+            f"{result['updates_per_second'] / baseline:>7.2f}x "
+            f"{result['score']:>9.0f} {result['max_tile']:>9.0f}"
+        )
+    print(f"\nLoss per {args.updates // args.points} updates")
+    print(f"{'updates':>8} " + " ".join(f"{r['precision']:>15}" for r in results))
+    for points in zip(*(result["curve"] for result in results)):
+        print(f"{points[0]['updates']:>8} " + " ".join(f"{p['loss']:>15.6f}" for p in points))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Serving load generator.
+Sends random boards from many concurrent clients to a running `serve.py`,
+then reports client-side throughput and latencies together with the server statistics.
+Usage: python -m benchmarks.serving_load [--clients N] [--requests N] [--port PORT | --path PATH]
+"""
+
+import asyncio
+import json
+from argparse import ArgumentParser
+from random import randrange
+from time import perf_counter
+from typing import Dict, List
+
+from config import BOARD_SIZE, BOARD_UNIT
+from game import Direction, State
+from game.base import Action
+from game.base.server.statistics import percentile
+
+def create_boards(count: int) -> List[List[List[int]]]:
+    """
+    # Arguments
+        count: int. The number of boards.
+    # Returns boards reached by playing random moves from fresh games.
+    """
+    boards = []
+    state = State(size=BOARD_SIZE, unit=BOARD_UNIT)
+    state.reset()
+    while len(boards) < count:
+        if state.is_ended():
+            state.reset()
+        state.executed(Action(randrange(len(Direction))))
+        boards.append(state.board)
+    return boards
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, data: Dict) -> Dict:
+    """
+    # Arguments
+        reader: asyncio.StreamReader. Reader of the connection.
+        writer: asyncio.StreamWriter. Writer of the connection.
+        data: Dict. Request.
+    # Returns the response.
+    """
+    writer.write(json.dumps(data).encode() + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response
+
+async def connect(args):
+    """
+    # Returns a new connection to the server.
+    """
+    if args.path is not None:
+        return await asyncio.open_unix_connection(args.path)
+    return await asyncio.open_connection(args.host, args.port)
+
+async def run_client(args, boards: List[List[List[int]]], latencies: List[float]):
+    """
+    Sends the boards one by one, waiting for each response before the next request.
+    """
+    reader, writer = await connect(args)
+    for board in boards:
+        started = perf_counter()
+        await request(reader, writer, {"board": board})
+        latencies.append(perf_counter() - started)
+    writer.close()
+
+async def main(args):
+    boards = create_boards(args.clients * args.requests)
+    latencies = []
+    started = perf_counter()
+    await asyncio.gather(*[
+        run_client(args, boards[i * args.requests:(i + 1) * args.requests], latencies)
+        for i in range(args.clients)
+    ])
+    elapsed = perf_counter() - started
+    latencies.sort()
+    print(f"Clients: {args.clients}, requests: {len(latencies)}, elapsed: {elapsed:.2f}s")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} requests/s")
+    print(
+        f"Client latency: p50 {1000 * percentile(latencies, 50):.2f} ms, "
+        f"p99 {1000 * percentile(latencies, 99):.2f} ms"
+    )
+    reader, writer = await connect(args)
+    statistics = await request(reader, writer, {"statistics": True})
+    writer.close()
+    print(f"Server statistics: {json.dumps(statistics, indent=2)}")
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Load generator for serve.py")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8048)
+    parser.add_argument("--path", default=None, help="Unix socket path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,82 @@
+"""
+Config
+"""
+
+import json
+import os
+from pathlib import Path
+
+CURRENT_PATH = Path(__file__).parent
+RESULT_PATH = CURRENT_PATH / "result"
+
+BOARD_SIZE = 4
+BOARD_UNIT = 2
+
+GAMMA = 0.99
+# Backend of the quality model, "dense" for the Keras model or "tuples" for the n-tuple network
+QUALITY_BACKEND = "dense"
+LEARNING_RATE = 1e-4
+# Sizes of the hidden dense layers
+LAYER_SIZES = [1024, 512, 256]
+# Size of the gradient steps a sampled batch is split into, Keras' default (32) if `None`
+FIT_BATCH_SIZE = None
+# Precision policy of the dense model: "float32", "mixed_bfloat16" (e.g. CPUs with AVX-512 BF16)
+# or "mixed_float16" (GPUs with tensor cores), variables and the loss stay in float32
+PRECISION = "float32"
+# Size of the micro-batches whose gradients are accumulated into every gradient step,
+# bounding the activation memory, gradient steps are computed at once if `None`
+MICRO_BATCH_SIZE = None
+# Local data-parallel workers sharing every gradient step, see `model.create_strategy`
+LEARNER_WORKERS_COUNT = 1
+# Cells (row, column) of the tuples of the n-tuple network, and the step size of its updates
+TUPLES = [
+    [(0, 0), (0, 1), (0, 2), (0, 3), (1, 0), (1, 1)],
+    [(1, 0), (1, 1), (1, 2), (1, 3), (2, 0), (2, 1)],
+    [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2)],
+    [(1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2)],
+]
+TUPLE_LEARNING_RATE = 0.1
+
+BATCH_SIZE = TRANSITIONS_COUNT = WARMUP_STEPS_COUNT = 5000
+# Directory where the random-policy transitions of the warmup are cached, keyed by board and seed,
+# the warmup steps are observed one by one if `None`
+WARMUP_PATH = CURRENT_PATH / "warmup"
+WARMUP_SEED = 0
+TARGET_SYNCING_FREQUENCY = 500
+EPSILON_START = 1.0
+EPSILON_END = 0.02
+EPSILON_DECAY_STEPS = 100000
+# Learn every `LEARNING_FREQUENCY` steps, `GRADIENT_STEPS_COUNT` updates each time
+LEARNING_FREQUENCY = 1
+GRADIENT_STEPS_COUNT = 1
+# Updates per step when learning in a background thread, decoupled from acting,
+# learning stays in the acting loop (with the schedule above) if `None`
+REPLAY_RATIO = None
+# Batches prepared ahead in background while learning, `0` to prepare them inline
+PREFETCH_DEPTH = 2
+# Probability of starting an episode from a banked mid or late game position, no bank if `0`
+BANKED_START_RATE = 0.0
+# The maximum number of banked positions, and the smallest largest tile of a banked position
+BANK_CAPACITY = 100000
+BANK_MIN_TILE = 128
+
+# Math threads of TensorFlow, its default (all cores) if `None`
+THREADS_COUNT = None
+
+STEPS_COUNT = 2000000
+PLAY_EPISODES_COUNT = 10
+LOG_FREQUENCY = 100
+# How often the memory footprint is reported, and whether Python allocations are traced for it
+MEMORY_REPORT_FREQUENCY = 10000
+IS_TRACING_MEMORY = False
+
+# Directory where observed and played transitions are recorded, recording is disabled if `None`
+RECORDING_PATH = None
+
+# Constants can be overridden with a JSON object, e.g. by `sweep.py`:
+# DQN_2048_CONFIG='{"GAMMA": 0.95, "RESULT_PATH": "result/trial_0"}' python main.py <gpu_id>
+_OVERRIDES = json.loads(os.environ.get("DQN_2048_CONFIG", "{}"))
+for _name, _value in _OVERRIDES.items():
+    if _name not in globals() or not _name.isupper():
+        raise KeyError(f"Unknown config constant: {_name}")
+    globals()[_name] = Path(_value) if _name.endswith("_PATH") and _value is not None else _value
@@ -0,0 +1,122 @@
+"""
+Evaluate. Plays many games with a saved checkpoint across a process pool
+and reports the max tile distribution, score percentiles and episode lengths.
+Usage: python evaluate.py [--games 10000] [--workers N] [--batch-size 64]
+"""
+
+import json
+import os
+from argparse import ArgumentParser
+from multiprocessing import get_context
+from time import perf_counter
+from typing import List, Tuple
+
+from config import RESULT_PATH, BOARD_SIZE, BOARD_UNIT, GAMMA
+from game import Direction, StateBuilder
+from game.base import Evaluator, RunningAggregate, Histogram
+
+# Tiles whose reach rates are reported
+REPORTED_TILES = [2 ** exponent for exponent in range(9, 16)]
+
+_evaluator: Evaluator = None
+
+def initialize_worker(result_path: str, precision: str, batch_size: int, threads_count: int):
+    """
+    Loads the checkpoint once per worker process.
+    # Arguments
+        result_path: str. Directory of the checkpoint.
+        precision: str. "keras" for the trained model,
+            otherwise the precision of the weights exported by `quantize.py`.
+        batch_size: int. The number of games played at once by the worker.
+        threads_count: int. The number of math threads of the worker.
+    """
+    global _evaluator # pylint: disable=global-statement
+    state_builder = StateBuilder().set_size(BOARD_SIZE).set_unit(BOARD_UNIT)
+    if precision != "keras":
+        # Quantized qualities run on NumPy only
+        from game import QuantizedQuality # pylint: disable=import-outside-toplevel
+        quality = QuantizedQuality(GAMMA, len(Direction), precision)
+        quality.load(result_path)
+        _evaluator = Evaluator(quality, state_builder, batch_size)
+        return
+    # Workers play on CPU, one core each by default so that throughput scales with processes
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+    import tensorflow as tf # pylint: disable=import-outside-toplevel
+    tf.config.threading.set_intra_op_parallelism_threads(threads_count)
+    tf.config.threading.set_inter_op_parallelism_threads(threads_count)
+    from model import create_quality_builder # pylint: disable=import-outside-toplevel
+    quality = create_quality_builder().build()
+    quality.load(result_path)
+    _evaluator = Evaluator(quality, state_builder, batch_size)
+
+def play_chunk(episodes_count: int) -> List[Tuple[int, int, int]]:
+    """
+    # Arguments
+        episodes_count: int. The number of games to be played.
+    # Returns the max tile, score and episode length of each game.
+    """
+    return [
+        (state.max_tile, state.score, transitions_count)
+        for state, transitions_count, _ in _evaluator.play(episodes_count)
+    ]
+
+def main():
+    parser = ArgumentParser(description="Evaluate a saved checkpoint on many games")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=64, help="Games at once per worker")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Games per streamed result")
+    parser.add_argument("--result-path", default=str(RESULT_PATH), help="Checkpoint directory")
+    parser.add_argument(
+        "--precision", default="keras", choices=["keras", "float32", "float16", "int8"],
+        help="Play with the Keras model or with weights exported by quantize.py, "
+             "float32 being the fastest on CPU"
+    )
+    parser.add_argument("--output", default=None, help="Path of the JSON report")
+    args = parser.parse_args()
+
+    # Inherited by the spawned workers, before they import NumPy
+    for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(args.threads_per_worker)
+
+    chunks = [args.chunk_size] * (args.games // args.chunk_size)
+    if args.games % args.chunk_size:
+        chunks.append(args.games % args.chunk_size)
+    max_tiles = Histogram()
+    scores = RunningAggregate(reservoir_size=args.games)
+    lengths = RunningAggregate(reservoir_size=args.games)
+    started = perf_counter()
+    # TensorFlow is not fork-safe, so workers are spawned
+    with get_context("spawn").Pool(
+            args.workers, initializer=initialize_worker,
+            initargs=(args.result_path, args.precision, args.batch_size, args.threads_per_worker)
+        ) as pool:
+        loaded = perf_counter()
+        for results in pool.imap_unordered(play_chunk, chunks):
+            for max_tile, score, transitions_count in results:
+                max_tiles.add(max_tile)
+                scores.add(score)
+                lengths.add(transitions_count)
+            elapsed = perf_counter() - loaded
+            print(f"{max_tiles.count}/{args.games} games, {max_tiles.count / elapsed:.1f} games/s")
+    elapsed = perf_counter() - started
+
+    report = {
+        "games": max_tiles.count,
+        "workers": args.workers,
+        "precision": args.precision,
+        "elapsed": elapsed,
+        "games_per_second": max_tiles.count / elapsed,
+        "max_tile": max_tiles.summary(),
+        "reach_rate": {str(tile): max_tiles.reach_rate(tile) for tile in REPORTED_TILES},
+        "score": scores.summary(quantiles=(0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)),
+        "episode_length": lengths.summary(quantiles=(0.01, 0.1, 0.5, 0.9, 0.99)),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
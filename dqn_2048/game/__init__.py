@@ -2,4 +2,9 @@
 Game
 """
 
-from .game_2048 import *
+from . import game_2048
+from .game_2048 import Direction, State, StateBuilder, Environment
+
+def __getattr__(name: str):
+    # Forward the lazily imported agent side, e.g. `from game import QualityBuilder, Agent`
+    return getattr(game_2048, name)
@@ -2,13 +2,42 @@
 Base
 """
 
+from importlib import import_module
+
 from .environment.state import State
 from .environment.state_builder import StateBuilder
 from .environment.action import Action
+from .environment.transition import Transition
 from .environment.environment import Environment
+from .environment.position_bank import PositionBank
+
+# The agent side depends on NumPy (and TensorFlow in concrete games),
+# so it is only imported on first access to keep the environment side standalone
+_LAZY_NAMES = {
+    "InferenceQuality": ".agent.inference_quality",
+    "Quality": ".agent.quality",
+    "QualityBuilder": ".agent.quality_builder",
+    "Experience": ".agent.experience",
+    "Decision": ".agent.decision",
+    "Agent": ".agent.agent",
+    "Statistics": ".server.statistics",
+    "Batcher": ".server.batcher",
+    "Server": ".server.server",
+    "RunningAggregate": ".metrics.aggregate",
+    "Histogram": ".metrics.aggregate",
+    "Logger": ".metrics.logger",
+    "Throughput": ".metrics.logger",
+    "deep_size": ".metrics.memory",
+    "process_memory": ".metrics.memory",
+    "start_tracing": ".metrics.memory",
+    "top_allocations": ".metrics.memory",
+    "Evaluator": ".evaluation.evaluator",
+    "Recorder": ".dataset.recorder",
+}
 
-from .agent.quality import Quality
-from .agent.quality_builder import QualityBuilder
-from .agent.experience import Experience
-from .agent.decision import Decision
-from .agent.agent import Agent
+def __getattr__(name: str):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -5,14 +5,20 @@ Agent
 from abc import abstractmethod
 from collections import deque
 from random import sample
-from typing import Tuple
+from threading import Condition, Lock, Thread
+from typing import Dict, List, Tuple
 
 from ..environment.state import State
 from ..environment.transition import Transition
 from ..environment.environment import Environment
+from ..dataset.recorder import Recorder
+from ..metrics.aggregate import RunningAggregate
+from ..metrics.memory import average_size, deep_size, process_memory
 from .quality_builder import QualityBuilder
 from .experience import Experience
+from .replay_entry import ReplayEntry
 from .decision import Decision
+from .prefetcher import Prefetcher
 
 class Agent:
     """
@@ -43,38 +49,200 @@ class Agent:
         self.target_syncing_frequency = target_syncing_frequency
         # Initialize parameters for Q(s, a) and Qˆ(s, a) with random weights
         # and empty transition buffer
+        self._quality_builder = quality_builder
         self._training_quality = quality_builder.build()
         self._target_quality = quality_builder.build()
         self._transitions = deque(maxlen=transitions_count)
+        # Bumped whenever Qˆ changes, which invalidates the target values cached in the buffer
+        self._target_version = 0
+        # Held while Qˆ is copied or used, which may happen on the prefetching thread
+        self._target_lock = Lock()
+        self.target_hits_count = 0
+        self.target_misses_count = 0
         self._step = 0
+        # Learn every `learning_frequency` steps, `gradient_steps_count` times each,
+        # see `set_schedule`, or in background, see `start_learning`
+        self.learning_frequency = 1
+        self.gradient_steps_count = 1
+        self.replay_ratio = None
+        self.slack_steps_count = 0
+        self._acting_quality = self._training_quality
+        self._acting_version = 0
+        self._snapshot = None
+        self._learning_thread: Thread = None
+        self._learning_condition = Condition()
+        self._is_learning_stopped = False
+        self._learning_error: BaseException = None
+        self._learning_origin = (0, 0)
+        self.updates_count = 0
+        self.loss = None
+        # Losses of every update since they were last collected, see `collected_losses`
+        self._losses = RunningAggregate()
+        self._losses_lock = Lock()
+        # Last learned batch, only measured when the memory is reported
+        self._prepared_batch = None
+        # Optionally keeps every observed transition, see `set_recorder`
+        self.recorder: Recorder = None
+        # Optionally prepares the next batches in background, see `set_prefetching`
+        self.prefetcher: Prefetcher = None
 
     def observe(self, environment: Environment):
         """
         # Arguments
             environment: Environment. The environment to observe.
         """
-        # Copy weights from Q to Qˆ
-        if self._step % self.target_syncing_frequency == 0:
-            self._target_quality.copied(self._training_quality)
+        is_learning_in_background = self._learning_thread is not None
+        if is_learning_in_background:
+            self._throttle_acting()
+            if self._learning_error is not None:
+                raise self._learning_error
+            self._refresh_acting_quality()
+        elif self._step % self.target_syncing_frequency == 0:
+            self._sync_target_quality()
         # Get current state of the environment
         if environment.current_state.is_ended():
             environment.reset()
         transition = self._transit(environment, True)
         # Store transition in the transition buffer
-        self._transitions.append(transition)
-        if self._step >= self.warmup_steps_count and len(self._transitions) >= self.batch_size:
-            # Sample a random batch from the buffer
-            transitions = sample(self._transitions, self.batch_size)
-            values = self._target_quality.calculate(transitions)
-            batch = [Experience(t.old_state, t.action, v) for t, v in zip(transitions, values)]
-            # Update Q(s, a)
-            self._training_quality.learn(batch)
+        self._transitions.append(ReplayEntry(transition))
+        if self.recorder is not None:
+            self.recorder.record(transition)
+        if (not is_learning_in_background and self._is_ready(self._step)
+                and self._step % self.learning_frequency == 0):
+            for _ in range(self.gradient_steps_count):
+                self._learn()
         self._step += 1
+        if is_learning_in_background:
+            with self._learning_condition:
+                self._learning_condition.notify_all()
+
+    def set_schedule(self, learning_frequency: int, gradient_steps_count: int):
+        """
+        # Arguments
+            learning_frequency: int. Learn every `learning_frequency` observed steps.
+            gradient_steps_count: int. The number of updates each time it learns.
+        """
+        self.learning_frequency = learning_frequency
+        self.gradient_steps_count = gradient_steps_count
+
+    def start_learning(self, replay_ratio: float, slack_steps_count: int = 100):
+        """
+        Learns in a background thread, decoupled from `observe` which only acts from now on.
+        Acting uses a snapshot of Q, republished after every update and swapped in without lock.
+        Whichever side gets ahead is throttled to keep the ratio of updates per observed step.
+        # Arguments
+            replay_ratio: float. Target number of updates per observed step.
+            slack_steps_count: int. How many steps acting may get ahead of learning
+                before it waits.
+        """
+        self.replay_ratio = replay_ratio
+        self.slack_steps_count = slack_steps_count
+        self._acting_quality = self._quality_builder.build()
+        self._acting_quality.copied(self._training_quality)
+        self._snapshot = (self.updates_count, self._training_quality.snapshot())
+        self._acting_version = self.updates_count
+        # The replay ratio is kept from now on
+        self._learning_origin = (self._step, self.updates_count)
+        self._is_learning_stopped = False
+        self._learning_thread = Thread(target=self._run_learning, daemon=True)
+        self._learning_thread.start()
+
+    def stop_learning(self):
+        """
+        Stops learning in background, `observe` learns by itself again.
+        """
+        if self._learning_thread is None:
+            return
+        with self._learning_condition:
+            self._is_learning_stopped = True
+            self._learning_condition.notify_all()
+        self._learning_thread.join()
+        self._learning_thread = None
+        self._acting_quality = self._training_quality
+        self._snapshot = None
+
+    def set_prefetching(self, depth: int):
+        """
+        Prepares the next batches (sampling, target values and arrays) in a background thread
+            while the current batch is being learned.
+        # Arguments
+            depth: int. The maximum number of batches prepared ahead, `0` to disable prefetching.
+        """
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+        self.prefetcher = Prefetcher(self._prepare_batch, depth) if depth > 0 else None
+
+    @property
+    def step(self) -> int:
+        """
+        # Returns the number of observed steps.
+        """
+        return self._step
+
+    @property
+    def transitions_count(self) -> int:
+        """
+        # Returns the number of transitions in the transition buffer.
+        """
+        return len(self._transitions)
+
+    def collected_losses(self) -> RunningAggregate:
+        """
+        # Returns the aggregate of the losses of all updates since the last call,
+            several per observed step with `gradient_steps_count` or when learning in background.
+        """
+        with self._losses_lock:
+            losses, self._losses = self._losses, RunningAggregate()
+        return losses
+
+    def memory(self, samples_count: int = 100) -> Dict:
+        """
+        # Arguments
+            samples_count: int. The number of transitions measured to estimate their size.
+        # Returns the estimated memory footprint of the transition buffer,
+            of the last prepared batch and of the quality models, with the process memory.
+        """
+        transition_size = average_size(self._transitions, samples_count)
+        qualities = {
+            "training": self._training_quality.memory(),
+            "target": self._target_quality.memory(),
+        }
+        if self._acting_quality is not self._training_quality:
+            qualities["acting"] = self._acting_quality.memory()
+        return {
+            "transitions": len(self._transitions),
+            "transition_bytes": transition_size,
+            "replay_bytes": transition_size * len(self._transitions),
+            "replay_capacity_bytes": transition_size * self._transitions.maxlen,
+            "prepared_batch_bytes": deep_size(self._prepared_batch),
+            "qualities": qualities,
+            "process": process_memory(),
+        }
+
+    def warm_up(self, transitions: List[Transition]):
+        """
+        Fills the transition buffer in bulk, in place of the first observed steps,
+            e.g. with random-policy transitions played beforehand. Must be called before learning.
+        # Arguments
+            transitions: List[Transition]. Transitions counted as observed steps.
+        """
+        self._transitions.extend(ReplayEntry(transition) for transition in transitions)
+        self._step += len(transitions)
+        # Q and Qˆ start from the same weights, as they would at the first observed step
+        self._sync_target_quality()
+
+    def set_recorder(self, recorder: Recorder):
+        """
+        # Arguments
+            recorder: Recorder. Recorder of observed transitions, `None` to stop recording.
+        """
+        self.recorder = recorder
 
-    def play(self, environment: Environment) -> Tuple[State, int, float]:
+    def play(self, environment: Environment, recorder: Recorder = None) -> Tuple[State, int, float]:
         """
         # Arguments
             environment: Environment. The environment to play inside.
+            recorder: Recorder = None. Recorder of played transitions.
         # Returns the last state, number of transitions, and the cumulative reward.
         """
         environment.reset()
@@ -82,6 +250,8 @@ class Agent:
         reward = 0
         while True:
             transition = self._transit(environment, False)
+            if recorder is not None:
+                recorder.record(transition)
             transitions_count += 1
             reward += transition.reward
             next_state = transition.state
@@ -93,7 +263,137 @@ class Agent:
         # Arguments
             dir_path: str. Path of directory to save the training quality model.
         """
-        self._training_quality.save(dir_path)
+        # While learning in background, the acting snapshot is the consistent copy of Q
+        self._acting_quality.save(dir_path)
+
+    def load(self, dir_path: str):
+        """
+        Load the saved quality model into both the training and the target quality models.
+        # Arguments
+            dir_path: str. Path of directory to load the saved quality model from.
+        """
+        self._training_quality.load(dir_path)
+        self._sync_target_quality()
+        if self._acting_quality is not self._training_quality:
+            self._acting_quality.copied(self._training_quality)
+
+    def _is_ready(self, step: int) -> bool:
+        """
+        # Arguments
+            step: int. Observed step.
+        # Returns a flag indicates whether learning has started at the given step.
+        """
+        return step >= self.warmup_steps_count and len(self._transitions) >= self.batch_size
+
+    def _is_learning_behind(self, slack: float = 0.0) -> bool:
+        """
+        # Arguments
+            slack: float. The number of updates learning may lag behind.
+        # Returns a flag indicates whether there are fewer updates than the replay ratio asks for.
+        """
+        if not self._is_ready(self._step):
+            return False
+        origin_step, origin_updates_count = self._learning_origin
+        origin_step = max(origin_step, self.warmup_steps_count, self.batch_size)
+        updates_count = self.updates_count - origin_updates_count
+        return updates_count + slack < self.replay_ratio * (self._step - origin_step)
+
+    def _throttle_acting(self):
+        """
+        Waits while learning lags too far behind acting.
+        """
+        slack = self.replay_ratio * self.slack_steps_count
+        with self._learning_condition:
+            self._learning_condition.wait_for(
+                lambda: self._is_learning_stopped or not self._is_learning_behind(slack)
+            )
+
+    def _refresh_acting_quality(self):
+        """
+        Swaps in the latest snapshot of Q published by the learning thread, if any.
+        """
+        version, snapshot = self._snapshot
+        if version != self._acting_version:
+            self._acting_quality.restored(snapshot)
+            self._acting_version = version
+
+    def _run_learning(self):
+        """
+        Learns until stopped, never getting ahead of the replay ratio.
+        """
+        synced_period = None
+        try:
+            while True:
+                with self._learning_condition:
+                    self._learning_condition.wait_for(
+                        lambda: self._is_learning_stopped or self._is_learning_behind()
+                    )
+                    if self._is_learning_stopped:
+                        return
+                # Copy weights from Q to Qˆ every `target_syncing_frequency` observed steps
+                period = self._step // self.target_syncing_frequency
+                if period != synced_period:
+                    self._sync_target_quality()
+                    synced_period = period
+                self._learn()
+                self._snapshot = (self.updates_count, self._training_quality.snapshot())
+                with self._learning_condition:
+                    self._learning_condition.notify_all()
+        except BaseException as error: # pylint: disable=broad-except
+            # Surface the error in `observe` instead of leaving acting throttled forever
+            with self._learning_condition:
+                self._learning_error = error
+                self._is_learning_stopped = True
+                self._learning_condition.notify_all()
+
+    def _sync_target_quality(self):
+        """
+        Copy weights from Q to Qˆ.
+        """
+        with self._target_lock:
+            self._target_quality.copied(self._training_quality)
+            # Only once copied, so that no value calculated with the old weights
+            # gets the new version
+            self._target_version += 1
+            if self.prefetcher is not None:
+                # Batches prepared in background are outdated once Qˆ changes
+                self.prefetcher.invalidate()
+
+    def _learn(self):
+        """
+        Update Q(s, a) from a random batch of the buffer.
+        """
+        if self.prefetcher is not None:
+            prepared_batch = self.prefetcher.get()
+        else:
+            prepared_batch = self._prepare_batch()
+        self._prepared_batch = prepared_batch
+        self.loss = self._training_quality.fit(prepared_batch)
+        with self._losses_lock:
+            self._losses.add(self.loss)
+        self.updates_count += 1
+
+    def _prepare_batch(self):
+        """
+        # Returns a random batch sampled from the buffer, prepared for learning.
+        """
+        entries = sample(self._transitions, self.batch_size)
+        with self._target_lock:
+            # Qˆ is frozen between syncs, only the values not calculated since the last sync are
+            version = self._target_version
+            missed_entries = [e for e in entries if e.target_version != version]
+            if missed_entries:
+                values = self._target_quality.calculate([e.transition for e in missed_entries])
+                for entry, value in zip(missed_entries, values):
+                    entry.target_value = value
+                    entry.target_version = version
+            batch = [
+                Experience(e.transition.old_state, e.transition.action, e.target_value)
+                for e in entries
+            ]
+        self.target_hits_count += len(entries) - len(missed_entries)
+        self.target_misses_count += len(missed_entries)
+        return self._training_quality.prepare(batch)
 
     def _transit(self, environment: Environment, is_learning: bool) -> Transition:
         """
@@ -105,9 +405,9 @@ class Agent:
         """
         state = environment.current_state
         if not is_learning or self._make_decision() == Decision.EXPLOIT:
-            action = self._training_quality.act(state)
+            action = self._acting_quality.act(state)
         else:
-            action = self._training_quality.randomly_act()
+            action = self._acting_quality.randomly_act()
         # Execute action a in an emulator and observe reward r and the next state s'
         transition = environment.execute(action)
         if is_learning:
@@ -115,7 +415,7 @@ class Agent:
         # If the state has not been changed, keep randomly transiting until it is updated
         if transition.state == state:
             while True:
-                action = self._training_quality.randomly_act()
+                action = self._acting_quality.randomly_act()
                 transition = environment.execute(action)
                 if transition.state != state:
                     break
@@ -0,0 +1,114 @@
+"""
+Prefetcher
+"""
+
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from time import perf_counter
+from typing import Any, Callable, Dict
+
+class Prefetcher:
+    """
+    Prefetcher. Prepares the next batches in a background thread
+        while the current one is being learned.
+    Batches are tagged with a version, so that the ones prepared before `invalidate`
+        (e.g. with the weights of an outdated target quality model) are never returned.
+    """
+
+    def __init__(self, produce: Callable[[], Any], depth: int):
+        """
+        # Arguments
+            produce: Callable[[], Any]. Prepares a new batch, called from the background thread.
+            depth: int. The maximum number of batches prepared ahead.
+        """
+        self.produce = produce
+        self.depth = depth
+        self.gets_count = 0
+        self.waits_count = 0
+        self.wait_time = 0.0
+        self.discarded_count = 0
+        self._queue = Queue(maxsize=depth)
+        self._version = 0
+        self._stopped = Event()
+        self._thread: Thread = None
+        self._error: BaseException = None
+
+    def get(self) -> Any:
+        """
+        # Returns the next prepared batch, waiting for it if none is ready yet.
+        """
+        if self._thread is None:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self.gets_count += 1
+        started = perf_counter()
+        is_waiting = self._queue.empty()
+        while True:
+            try:
+                version, batch = self._queue.get(timeout=1.0)
+            except Empty:
+                if self._error is not None:
+                    raise self._error
+                continue
+            if version == self._version:
+                break
+            self.discarded_count += 1
+            is_waiting = True
+        if is_waiting:
+            self.waits_count += 1
+            self.wait_time += perf_counter() - started
+        return batch
+
+    def invalidate(self):
+        """
+        Discards the batches prepared so far, including the one being prepared.
+        """
+        self._version += 1
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                break
+            self.discarded_count += 1
+
+    def stop(self):
+        """
+        Stops the background thread, the next `get` starts it again.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._stopped.clear()
+        self.invalidate()
+
+    @property
+    def statistics(self) -> Dict:
+        """
+        # Returns how often and how long the learner waited for a batch.
+        """
+        return {
+            "gets": self.gets_count,
+            "waits": self.waits_count,
+            "wait_ratio": self.waits_count / self.gets_count if self.gets_count else 0.0,
+            "wait_time": self.wait_time,
+            "discarded": self.discarded_count,
+        }
+
+    def _run(self):
+        """
+        Keeps the queue filled until stopped.
+        """
+        try:
+            while not self._stopped.is_set():
+                version = self._version
+                batch = self.produce()
+                while not self._stopped.is_set():
+                    try:
+                        self._queue.put((version, batch), timeout=0.1)
+                        break
+                    except Full:
+                        if version != self._version:
+                            break
+        except BaseException as error: # pylint: disable=broad-except
+            self._error = error
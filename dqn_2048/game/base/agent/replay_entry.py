@@ -0,0 +1,21 @@
+"""
+Replay entry
+"""
+
+from ..environment.transition import Transition
+
+class ReplayEntry:
+    """
+    Replay entry. A transition of the buffer, with its target value cached
+        as long as the target quality model is unchanged.
+    """
+
+    def __init__(self, transition: Transition):
+        """
+        # Arguments
+            transition: Transition. Observed transition.
+        """
+        self.transition = transition
+        # Version of the target quality model the cached value was calculated with
+        self.target_version: int = None
+        self.target_value: float = None
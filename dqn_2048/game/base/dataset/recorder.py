@@ -0,0 +1,31 @@
+"""
+Recorder
+"""
+
+from abc import abstractmethod
+
+from ..environment.transition import Transition
+
+class Recorder:
+    """
+    Recorder. Keeps the transitions an agent goes through.
+    """
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @abstractmethod
+    def record(self, transition: Transition):
+        """
+        # Arguments
+            transition: Transition. Transition to be recorded.
+        """
+
+    @abstractmethod
+    def close(self):
+        """
+        Stores everything which has been recorded so far.
+        """
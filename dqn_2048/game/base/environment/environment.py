@@ -2,10 +2,13 @@
 Environment
 """
 
+from random import random
+
 from .state import State
 from .state_builder import StateBuilder
 from .action import Action
 from .transition import Transition
+from .position_bank import PositionBank
 
 class Environment:
     """
@@ -18,14 +21,31 @@ class Environment:
             state_builder: StateBuilder. State builder.
         """
         self._state = self._create(state_builder)
+        self.bank: PositionBank = None
+        self.banked_rate = 0.0
         self.reset()
 
+    def set_bank(self, bank: PositionBank, banked_rate: float = 0.0):
+        """
+        Every reached state is offered to the bank from now on.
+        # Arguments
+            bank: PositionBank. Bank of positions, may be shared between environments.
+            banked_rate: float = 0.0. Probability of resetting to a banked position
+                instead of the initial state, `0` to only fill the bank (e.g. when evaluating).
+        """
+        self.bank = bank
+        self.banked_rate = banked_rate
+        return self
+
     def reset(self) -> State:
         """
-        Resets to initial state.
+        Resets to initial state, or to a banked position with probability `banked_rate`.
         # Returns reset state.
         """
-        self._state.reset()
+        if self.bank is not None and len(self.bank) > 0 and random() < self.banked_rate:
+            self._state = self.bank.sample()
+        else:
+            self._state.reset()
         return self.current_state
 
     def execute(self, action: Action) -> Transition:
@@ -36,6 +56,9 @@ class Environment:
         """
         old_state = self.current_state
         reward = self._state.executed(action)
+        # A move that does not change the board would bank the same position again
+        if self.bank is not None and self._state != old_state:
+            self.bank.add(self._state)
         # Passing the cloned state instead of the original one as a parameter to prevent the value
         # from being accidentally changed due to the environment's state updating
         return Transition(old_state, action, reward, self.current_state)
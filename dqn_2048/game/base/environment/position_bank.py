@@ -0,0 +1,79 @@
+"""
+Position bank
+"""
+
+from abc import abstractmethod
+from random import Random
+
+from .state import State
+
+class PositionBank:
+    """
+    Position bank. A bounded, uniform sample of the positions reached so far,
+        episodes can be started from to skip the easy beginning of the game.
+    Positions are kept by reservoir sampling: after `n` admitted positions,
+        each one of them is in the bank with the same probability `capacity / n`.
+    """
+
+    def __init__(self, capacity: int, seed: int = None):
+        """
+        # Arguments
+            capacity: int. The maximum number of positions kept.
+            seed: int = None. Seed of the random generator used for keeping and sampling.
+        """
+        self.capacity = capacity
+        # The number of positions admitted so far, kept or not
+        self.seen_count = 0
+        self._count = 0
+        self._random = Random(seed)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, state: State):
+        """
+        # Arguments
+            state: State. Reached position, kept only if it is admitted and drawn.
+        """
+        if not self._is_admitted(state):
+            return
+        self.seen_count += 1
+        if self._count < self.capacity:
+            self._stored(self._count, state)
+            self._count += 1
+            return
+        index = self._random.randrange(self.seen_count)
+        if index < self.capacity:
+            self._stored(index, state)
+
+    def sample(self) -> State:
+        """
+        # Returns a copy of a random kept position.
+        """
+        if self._count == 0:
+            raise IndexError("sample from an empty position bank")
+        return self._loaded(self._random.randrange(self._count))
+
+    def _is_admitted(self, state: State) -> bool:
+        """
+        # Arguments
+            state: State. Reached position.
+        # Returns a flag indicates whether the position is worth starting from.
+        """
+        return not state.is_ended()
+
+    @abstractmethod
+    def _stored(self, index: int, state: State):
+        """
+        # Arguments
+            index: int. Slot of the bank to be overwritten.
+            state: State. Position to be stored.
+        """
+
+    @abstractmethod
+    def _loaded(self, index: int) -> State:
+        """
+        # Arguments
+            index: int. Slot of the bank.
+        # Returns a new state from the stored position.
+        """
@@ -0,0 +1,78 @@
+"""
+Evaluator
+"""
+
+from typing import List, Tuple
+
+from ..environment.state import State
+from ..environment.state_builder import StateBuilder
+from ..environment.action import Action
+from ..agent.inference_quality import InferenceQuality
+
+class Evaluator:
+    """
+    Evaluator. Plays many games greedily at once,
+        predicting the actions of all running games in a single batch.
+    """
+
+    def __init__(self, quality: InferenceQuality, state_builder: StateBuilder, batch_size: int):
+        """
+        # Arguments
+            quality: InferenceQuality. The quality model to be evaluated.
+            state_builder: StateBuilder. Builder of the initial states.
+            batch_size: int. The number of games played at once.
+        """
+        self.quality = quality
+        self.state_builder = state_builder
+        self.batch_size = batch_size
+
+    def play(
+            self, episodes_count: int, recorded_states: List[State] = None
+        ) -> List[Tuple[State, int, float]]:
+        """
+        Plays like `Agent.play`: the best action is executed,
+            and random actions are tried whenever it does not change the state.
+        # Arguments
+            episodes_count: int. The number of games to be played.
+            recorded_states: List[State] = None. If given, every state the actions
+                are selected from is appended to it.
+        # Returns the last state, number of transitions, and the cumulative reward of each game.
+        """
+        results = []
+        games: List[List] = [] # Each game is a list of state, transitions count and reward
+        started_count = 0
+        while len(results) < episodes_count:
+            # Keep the batch full while there are games left to be started
+            while len(games) < self.batch_size and started_count < episodes_count:
+                state = self.state_builder.build()
+                state.reset()
+                games.append([state, 0, 0.0])
+                started_count += 1
+            states = [state for state, _, _ in games]
+            if recorded_states is not None:
+                recorded_states.extend(state.clone() for state in states)
+            values = self.quality.evaluate(states)
+            running_games = []
+            for game, game_values in zip(games, values):
+                state = game[0]
+                game[2] += self._execute(state, int(game_values.argmax()))
+                game[1] += 1
+                if state.is_ended():
+                    results.append(tuple(game))
+                else:
+                    running_games.append(game)
+            games = running_games
+        return results
+
+    def _execute(self, state: State, action_index: int) -> float:
+        """
+        # Arguments
+            state: State. State to be changed.
+            action_index: int. Index of the best action.
+        # Returns the reward.
+        """
+        old_state = state.clone()
+        reward = state.executed(Action(action_index))
+        while state == old_state:
+            reward = state.executed(self.quality.randomly_act())
+        return reward
@@ -0,0 +1,152 @@
+"""
+Aggregate
+"""
+
+from collections import Counter
+from math import sqrt
+from random import randrange
+from typing import Dict, Iterable, List
+
+class RunningAggregate:
+    """
+    Running aggregate. Online mean, deviation, extremes and approximate quantiles of a stream,
+        using bounded memory whatever the length of the stream.
+    """
+
+    def __init__(self, reservoir_size: int = 4096):
+        """
+        # Arguments
+            reservoir_size: int. The number of values kept for estimating quantiles.
+                Quantiles are exact until more values than this have been added.
+        """
+        self.reservoir_size = reservoir_size
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = None
+        self.maximum = None
+        self._squared_deviations = 0.0
+        self._reservoir: List[float] = []
+
+    def add(self, value: float):
+        """
+        # Arguments
+            value: float. New value of the stream.
+        """
+        # Welford's algorithm
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squared_deviations += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        # Reservoir sampling, every value has the same chance to be kept
+        if len(self._reservoir) < self.reservoir_size:
+            self._reservoir.append(value)
+        else:
+            index = randrange(self.count)
+            if index < self.reservoir_size:
+                self._reservoir[index] = value
+
+    def extend(self, values: Iterable[float]):
+        """
+        # Arguments
+            values: Iterable[float]. New values of the stream.
+        """
+        for value in values:
+            self.add(value)
+
+    @property
+    def deviation(self) -> float:
+        """
+        # Returns the standard deviation.
+        """
+        return sqrt(self._squared_deviations / self.count) if self.count > 0 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        # Arguments
+            q: float. Quantile in range [0, 1].
+        # Returns the (approximate) quantile, or `None` if no value has been added.
+        """
+        if not self._reservoir:
+            return None
+        values = sorted(self._reservoir)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.9, 0.99)) -> Dict:
+        """
+        # Arguments
+            quantiles: Iterable[float]. Quantiles to be reported.
+        # Returns the summary of the stream.
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "deviation": self.deviation,
+            "min": self.minimum,
+            "max": self.maximum,
+            **{f"p{q * 100:g}": self.quantile(q) for q in quantiles if self._reservoir},
+        }
+
+class Histogram:
+    """
+    Histogram. Exact counts of a stream of discrete values, such as max tiles.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._counts = Counter()
+
+    def add(self, value: int):
+        """
+        # Arguments
+            value: int. New value of the stream.
+        """
+        self.count += 1
+        self._counts[value] += 1
+
+    def extend(self, values: Iterable[int]):
+        """
+        # Arguments
+            values: Iterable[int]. New values of the stream.
+        """
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "Histogram"):
+        """
+        # Arguments
+            other: Histogram. Histogram whose counts are added to this one.
+        """
+        self.count += other.count
+        self._counts.update(other._counts)
+
+    def quantile(self, q: float) -> int:
+        """
+        # Arguments
+            q: float. Quantile in range [0, 1].
+        # Returns the quantile, or `None` if no value has been added.
+        """
+        rank = min(self.count - 1, int(q * self.count))
+        seen = 0
+        for value in sorted(self._counts):
+            seen += self._counts[value]
+            if seen > rank:
+                return value
+        return None
+
+    def reach_rate(self, value: int) -> float:
+        """
+        # Arguments
+            value: int. Threshold value.
+        # Returns the fraction of values which are greater than or equal to the threshold.
+        """
+        if self.count == 0:
+            return 0.0
+        return sum(c for v, c in self._counts.items() if v >= value) / self.count
+
+    def summary(self) -> Dict:
+        """
+        # Returns the counts by value.
+        """
+        return {str(value): self._counts[value] for value in sorted(self._counts)}
@@ -0,0 +1,87 @@
+"""
+Logger
+"""
+
+import json
+from time import perf_counter, time
+from typing import Dict, List
+
+class Logger:
+    """
+    Logger. Streams metrics records to a JSON Lines file.
+    Records are buffered in memory and written in batches,
+        instead of flushing the file for each record.
+    """
+
+    def __init__(self, file_path: str, buffer_size: int = 64, flush_interval: float = 10.0):
+        """
+        # Arguments
+            file_path: str. Path of the JSON Lines file, records are appended to it.
+            buffer_size: int. The number of buffered records which triggers a flush.
+            flush_interval: float. The maximum time (in seconds) a record stays in the buffer,
+                checked whenever a new record is written.
+        """
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._file = open(file_path, "a")
+        self._buffer: List[str] = []
+        self._flushed_time = perf_counter()
+
+    def __enter__(self) -> "Logger":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def write(self, kind: str, record: Dict):
+        """
+        # Arguments
+            kind: str. Kind of the record, e.g. "training" or "evaluation".
+            record: Dict. JSON serializable fields of the record.
+        """
+        self._buffer.append(json.dumps({"kind": kind, "time": time(), **record}))
+        if (len(self._buffer) >= self.buffer_size
+                or perf_counter() - self._flushed_time >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes all buffered records to the file.
+        """
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+        self._flushed_time = perf_counter()
+
+    def close(self):
+        """
+        Flushes then closes the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+class Throughput:
+    """
+    Throughput. Rate of a growing counter between two consecutive measurements.
+    """
+
+    def __init__(self, count: int = 0):
+        """
+        # Arguments
+            count: int. Initial value of the counter.
+        """
+        self._count = count
+        self._time = perf_counter()
+
+    def measure(self, count: int) -> float:
+        """
+        # Arguments
+            count: int. Current value of the counter.
+        # Returns the count per second since the last measurement.
+        """
+        now = perf_counter()
+        rate = (count - self._count) / max(now - self._time, 1e-9)
+        self._count, self._time = count, now
+        return rate
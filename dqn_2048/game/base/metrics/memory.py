@@ -0,0 +1,104 @@
+"""
+Memory
+"""
+
+import sys
+import tracemalloc
+from random import sample
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+def deep_size(value, seen: set = None) -> int:
+    """
+    Estimates the memory held by an object and everything it references.
+    Objects shared by the interpreter (small integers, `None`, booleans, classes) are not counted.
+    # Arguments
+        value: Any. Object to be measured.
+        seen: set = None. Ids of objects already counted, shared between calls if given.
+    # Returns the size in bytes.
+    """
+    seen = set() if seen is None else seen
+    stack = [value]
+    size = 0
+    while stack:
+        current = stack.pop()
+        if (current is None or isinstance(current, (bool, type))
+                or isinstance(current, int) and -5 <= current <= 256 or id(current) in seen):
+            continue
+        seen.add(id(current))
+        if isinstance(current, np.ndarray):
+            # Views do not own their data
+            size += sys.getsizeof(current) if current.base is not None else current.nbytes + 112
+            continue
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__"):
+            stack.append(current.__dict__)
+    return size
+
+def average_size(values: Sequence, samples_count: int = 100) -> float:
+    """
+    # Arguments
+        values: Sequence. Objects to be measured, e.g. the transition buffer.
+        samples_count: int. The number of randomly sampled objects which are measured.
+    # Returns the average size in bytes of one object.
+    """
+    if len(values) == 0:
+        return 0.0
+    sampled_values = sample(values, min(samples_count, len(values)))
+    return sum(deep_size(value) for value in sampled_values) / len(sampled_values)
+
+def process_memory() -> Dict[str, int]:
+    """
+    # Returns the current and peak resident set sizes of the process in bytes,
+        the current one is `None` where `/proc` is not available.
+    """
+    current = None
+    try:
+        with open("/proc/self/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource # pylint: disable=import-outside-toplevel
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        peak = peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        peak = None
+    return {"rss": current, "peak_rss": peak}
+
+def start_tracing(frames_count: int = 1):
+    """
+    Starts tracing Python allocations, which `top_allocations` reports on.
+    Tracing slows allocations down, so it is only started on demand.
+    # Arguments
+        frames_count: int. The number of frames kept per allocation.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames_count)
+
+def top_allocations(limit: int = 10) -> List[Dict]:
+    """
+    # Arguments
+        limit: int. The number of reported locations.
+    # Returns the source lines holding the most traced memory, empty if tracing is not started.
+    """
+    if not tracemalloc.is_tracing():
+        return []
+    statistics = tracemalloc.take_snapshot().statistics("lineno")
+    return [
+        {
+            "location": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+            "size": s.size,
+            "count": s.count,
+        }
+        for s in statistics[:limit]
+    ]
@@ -0,0 +1,129 @@
+"""
+Batcher
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import List, Tuple
+
+import numpy as np
+
+from ..environment.state import State
+from ..agent.inference_quality import InferenceQuality
+from .statistics import Statistics
+
+class Batcher:
+    """
+    Batcher. Coalesces concurrent prediction requests into batched forward passes.
+    """
+
+    def __init__(
+            self,
+            quality: InferenceQuality, max_batch_size: int = 256, max_wait_time: float = 0.002
+        ):
+        """
+        # Arguments
+            quality: InferenceQuality. The quality model used for predicting action values.
+            max_batch_size: int. The maximum number of states in a single forward pass.
+            max_wait_time: float. How long (in seconds) the first request of a batch waits
+                for other requests to join it.
+        """
+        self.quality = quality
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self.statistics = Statistics()
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        # Forward passes are blocking, run them one at a time off the event loop
+        # so that new requests keep queueing up while a batch is being predicted
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def start(self):
+        """
+        Starts batching on the running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops batching, pending requests are cancelled.
+        """
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+        self._executor.shutdown()
+
+    async def predict(self, state: State) -> np.ndarray:
+        """
+        # Arguments
+            state: State. Observed state.
+        # Returns action values of the given state.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((state, future, perf_counter()))
+        return await future
+
+    async def _run(self):
+        """
+        Serves queued requests batch by batch.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = await self._collect()
+            states = [state for state, _, _ in requests]
+            try:
+                values = await loop.run_in_executor(self._executor, self.quality.evaluate, states)
+            except Exception: # pylint: disable=broad-except
+                # Retried request by request, so that a bad state fails only its own request
+                values = await loop.run_in_executor(self._executor, self._evaluated_each, states)
+            finished_time = perf_counter()
+            for (_, future, _), value in zip(requests, values):
+                if future.done():
+                    continue
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
+            self.statistics.record([finished_time - started for _, _, started in requests])
+
+    def _evaluated_each(self, states: List[State]) -> List:
+        """
+        # Arguments
+            states: List[State]. Requested states.
+        # Returns action values of each state, or the exception raised while predicting it.
+        """
+        values = []
+        for state in states:
+            try:
+                values.append(self.quality.evaluate([state])[0])
+            except Exception as error: # pylint: disable=broad-except
+                values.append(error)
+        return values
+
+    async def _collect(self) -> List[Tuple[State, asyncio.Future, float]]:
+        """
+        # Returns the next batch of requests, bounded by the maximum batch size and waiting time.
+        """
+        loop = asyncio.get_running_loop()
+        requests = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_time
+        while len(requests) < self.max_batch_size:
+            # Take whatever has already arrived before waiting for anything else
+            if not self._queue.empty():
+                requests.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                requests.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return requests
@@ -0,0 +1,100 @@
+"""
+Server
+"""
+
+import asyncio
+import json
+from abc import abstractmethod
+from typing import Dict
+
+import numpy as np
+
+from ..environment.state import State
+from .batcher import Batcher
+
+class Server:
+    """
+    Server. Answers newline-delimited JSON requests over TCP or a Unix socket.
+    Each request is a JSON object on its own line, and so is each response.
+    The request `{"statistics": true}` returns the batcher statistics.
+    """
+
+    def __init__(self, batcher: Batcher):
+        """
+        # Arguments
+            batcher: Batcher. Batcher used for predicting action values.
+        """
+        self.batcher = batcher
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8048, path: str = None):
+        """
+        Serves until cancelled.
+        # Arguments
+            host: str. Host to listen on.
+            port: int. Port to listen on.
+            path: str = None. Path of the Unix socket, used instead of `host` and `port` if given.
+        """
+        self.batcher.start()
+        try:
+            if path is not None:
+                server = await asyncio.start_unix_server(self._handle, path=path)
+            else:
+                server = await asyncio.start_server(self._handle, host=host, port=port)
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves a single connection, request by request.
+        # Arguments
+            reader: asyncio.StreamReader. Reader of the connection.
+            writer: asyncio.StreamWriter. Writer of the connection.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self._respond(json.loads(line))
+                except (ValueError, KeyError, TypeError) as error:
+                    response = {"error": str(error)}
+                except Exception as error: # pylint: disable=broad-except
+                    # Failed prediction, the connection is kept for the next requests
+                    response = {"error": f"{type(error).__name__}: {error}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request: Dict) -> Dict:
+        """
+        # Arguments
+            request: Dict. Decoded request.
+        # Returns the response to be encoded.
+        """
+        if request.get("statistics"):
+            return self.batcher.statistics.report()
+        state = self._decode(request)
+        values = await self.batcher.predict(state)
+        return self._encode(values)
+
+    @abstractmethod
+    def _decode(self, request: Dict) -> State:
+        """
+        # Arguments
+            request: Dict. Decoded request.
+        # Returns the requested state.
+        """
+
+    @abstractmethod
+    def _encode(self, values: np.ndarray) -> Dict:
+        """
+        # Arguments
+            values: np.ndarray. Action values of the requested state.
+        # Returns the response.
+        """
@@ -0,0 +1,62 @@
+"""
+Statistics
+"""
+
+from collections import Counter, deque
+from typing import Dict, List
+
+class Statistics:
+    """
+    Statistics. Latency and batch size histograms of a serving batcher.
+    """
+
+    def __init__(self, window: int = 100000):
+        """
+        # Arguments
+            window: int. The number of most recent latencies used for computing percentiles.
+        """
+        self.requests_count = 0
+        self.batches_count = 0
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = Counter()
+
+    def record(self, latencies: List[float]):
+        """
+        Record a served batch.
+        # Arguments
+            latencies: List[float]. Latency of each request in the batch, in seconds.
+        """
+        self.requests_count += len(latencies)
+        self.batches_count += 1
+        self._latencies.extend(latencies)
+        self._batch_sizes[len(latencies)] += 1
+
+    def report(self) -> Dict:
+        """
+        # Returns the summary of latencies (in milliseconds) and the batch size histogram.
+        """
+        latencies = sorted(self._latencies)
+        return {
+            "requests": self.requests_count,
+            "batches": self.batches_count,
+            "latency_ms": {
+                "mean": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50": 1000 * percentile(latencies, 50),
+                "p99": 1000 * percentile(latencies, 99),
+                "max": 1000 * latencies[-1] if latencies else 0.0,
+            },
+            "batch_sizes": dict(sorted(self._batch_sizes.items())),
+        }
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile.
+    # Arguments
+        sorted_values: List[float]. Values sorted in ascending order.
+        q: float. Percentile in range [0, 100].
+    # Returns the percentile, or `0.0` if there is no value.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
@@ -2,9 +2,33 @@
 Game 2048
 """
 
+from importlib import import_module
+
 from .environment.direction import Direction
+from .environment.state import State
 from .environment.state_builder import StateBuilder
 from .environment.environment import Environment
 
-from .agent.quality_builder import QualityBuilder
-from .agent.agent import Agent
+# The agent side is imported on first access only.
+# `Quality` is backed by TensorFlow, which is by far the most expensive import
+_LAZY_NAMES = {
+    "QualityBuilder": ".agent.quality_builder",
+    "Quality": ".agent.quality",
+    "QuantizedQuality": ".agent.quantized_quality",
+    "TupleQuality": ".agent.tuple_quality",
+    "TupleQualityBuilder": ".agent.tuple_quality_builder",
+    "Agent": ".agent.agent",
+    "Server": ".server.server",
+    "Engine": ".environment.engine",
+    "PositionBank": ".environment.position_bank",
+    "Recorder": ".dataset.recorder",
+    "Reader": ".dataset.reader",
+    "Warmup": ".dataset.warmup",
+}
+
+def __getattr__(name: str):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -29,9 +29,15 @@ class Agent(BaseAgent):
         self.epsilon_end = end
         self.epsilon_decay_steps = decay_steps
 
+    @property
+    def epsilon(self) -> float:
+        """
+        # Returns the current epsilon value of the decay schedule.
+        """
+        start, end, decay_steps = self.epsilon_start, self.epsilon_end, self.epsilon_decay_steps
+        return max((end - start) * self._step / decay_steps + start, end)
+
     def _make_decision(self) -> Decision:
         # With probability ε, select a random action, otherwise use quality model to act
-        start, end, decay_steps = self.epsilon_start, self.epsilon_end, self.epsilon_decay_steps
-        epsilon = max((end - start) * self._step / decay_steps + start, end)
-        is_exploring = uniform(0, start) < epsilon
+        is_exploring = uniform(0, self.epsilon_start) < self.epsilon
         return Decision.EXPLORE if is_exploring else Decision.EXPLOIT
@@ -3,13 +3,24 @@ Quality
 """
 
 import os
-from typing import Callable, List
+from typing import Callable, Dict, List, Tuple
 
 import numpy as np
-from tensorflow import where
+import tensorflow as tf
+from tensorflow import where, distribute
 from tensorflow.keras import Model, backend as K
 from tensorflow.keras.layers import Input, Lambda
 from tensorflow.keras.optimizers import Optimizer
+try:
+    from tensorflow.keras.mixed_precision import (
+        LossScaleOptimizer, global_policy, set_global_policy
+    )
+    DYNAMIC_LOSS_SCALE = True
+except ImportError: # TensorFlow < 2.4 only has the experimental API
+    from tensorflow.keras.mixed_precision.experimental import (
+        LossScaleOptimizer, global_policy, set_policy as set_global_policy
+    )
+    DYNAMIC_LOSS_SCALE = "dynamic"
 
 from ...base import Action, Quality as BaseQuality, Experience
 from ..environment.state import State
@@ -23,7 +34,11 @@ class Quality(BaseQuality):
             self,
             gamma: float, output_size: int,
             model_builder: Callable[[int], Model], optimizer: Optimizer,
-            delta_clip: float = np.inf
+            delta_clip: float = np.inf,
+            fit_batch_size: int = None,
+            strategy: distribute.Strategy = None,
+            micro_batch_size: int = None,
+            precision: str = "float32"
         ):
         """
         # Arguments
@@ -32,17 +47,49 @@ class Quality(BaseQuality):
             model_builder: Callable[[int], Model]. Takes output size as param and returns model.
             optimizer: Optimizer. Optimizer used when training model.
             delta_clip: float. Used for calculating loss.
+            fit_batch_size: int = None. Size of the gradient steps a learned batch is split into,
+                Keras' default (32) if `None`.
+            strategy: distribute.Strategy = None. Distribution strategy, e.g. for splitting
+                every gradient step across local workers.
+            micro_batch_size: int = None. If given, every gradient step (of `fit_batch_size`
+                samples, the whole batch if `None`) accumulates the gradients of micro-batches
+                of this size before a single update, bounding the activations kept at once.
+            precision: str = "float32". Precision policy of the model, "float32",
+                or "mixed_bfloat16" / "mixed_float16" to compute the layers in 16 bits
+                while variables, the loss and the updates stay in float32.
+                The last layer of the model should be built with `dtype="float32"`,
+                so that the action values are not rounded to 16 bits.
         """
+        if micro_batch_size is not None and strategy is not None:
+            raise ValueError("Micro-batching is not supported with a distribution strategy")
         super().__init__(gamma, output_size)
         self.delta_clip = delta_clip
-        self._model = model_builder(self.output_size)
+        self.fit_batch_size = fit_batch_size
+        self.micro_batch_size = micro_batch_size
+        self.precision = precision
+        self.strategy = strategy or distribute.get_strategy()
         # Create learning model which is actually used for training
         # For more details, see https://github.com/keras-rl/keras-rl/blob/master/rl/agents/dqn.py
-        self._learning_model = self._create_learning_model(
-            self._model, self.output_size, optimizer
-        )
+        with self.strategy.scope():
+            # Every quality built from the same builder gets its own slots and iterations,
+            # and variables, optimizer slots included, must be created under the strategy
+            optimizer = optimizer.__class__.from_config(optimizer.get_config())
+            if precision == "mixed_float16":
+                # Small float16 gradients would underflow to zero without loss scaling,
+                # bfloat16 has the range of float32 and does not need it
+                optimizer = LossScaleOptimizer(optimizer, DYNAMIC_LOSS_SCALE)
+            self._model = self._create_model(model_builder, self.output_size, precision)
+            self._learning_model = self._create_learning_model(
+                self._model, self.output_size, optimizer
+            )
+        # Traced once for any number of samples
+        self._accumulated_step = tf.function(self._accumulate, input_signature=[
+            tf.TensorSpec((None,) + self._model.input_shape[1:]),
+            tf.TensorSpec((None, self.output_size)),
+            tf.TensorSpec((None, self.output_size)),
+        ])
 
-    def learn(self, batch: List[Experience]):
+    def prepare(self, batch: List[Experience]) -> Tuple[np.ndarray, ...]:
         state_data = []
         targets = np.zeros((len(batch), self.output_size))
         masks = np.zeros((len(batch), self.output_size))
@@ -57,14 +104,54 @@ class Quality(BaseQuality):
         state_data = np.array(state_data)
         targets = np.array(targets).astype("float")
         masks = np.array(masks).astype("float")
-        self._learning_model.fit([state_data, targets, masks], [dummies, targets])
+        return (state_data, targets, masks, dummies)
+
+    def fit(self, prepared_batch: Tuple[np.ndarray, ...]) -> float:
+        state_data, targets, masks, dummies = prepared_batch
+        if self.micro_batch_size is not None:
+            return self._accumulated_fit(state_data, targets, masks)
+        history = self._learning_model.fit(
+            [state_data, targets, masks], [dummies, targets],
+            batch_size=self.fit_batch_size, verbose=0
+        )
+        return history.history["loss"][-1]
 
     def copied(self, training_quality: "Quality"):
         self._model.set_weights(training_quality.weights)
 
+    def snapshot(self) -> List[np.ndarray]:
+        return self.weights
+
+    def restored(self, snapshot: List[np.ndarray]):
+        self._model.set_weights(snapshot)
+
     def save(self, dir_path: str):
         self._model.save_weights(os.path.join(dir_path, "last.hdf5"))
 
+    def load(self, dir_path: str):
+        self._model.load_weights(os.path.join(dir_path, "last.hdf5"))
+
+    def memory(self) -> Dict[str, int]:
+        # Forward activations are kept for the backward pass, which produces as many gradients
+        # Variables stay in float32, activations are computed in 16 bits in mixed precision
+        itemsize = np.dtype(np.float32).itemsize if self.precision == "float32" else 2
+        activations = sum(
+            int(np.prod(layer.output_shape[1:])) * itemsize for layer in self._model.layers
+        )
+        optimizer = self._learning_model.optimizer
+        # Optimizers of TensorFlow >= 2.11 only have `variables`
+        optimizer_variables = (
+            optimizer.weights if hasattr(optimizer, "weights") else optimizer.variables
+        )
+        return {
+            "parameters": self._variables_size(self._model.weights),
+            "optimizer": self._variables_size(optimizer_variables),
+            "activations_per_sample": activations,
+            "step_activations": 2 * activations * (
+                self.micro_batch_size or self.fit_batch_size or 32
+            ),
+        }
+
     @property
     def weights(self) -> List[np.ndarray]:
         """
@@ -73,7 +160,101 @@ class Quality(BaseQuality):
         return self._model.get_weights()
 
     def _predict(self, states: List[State]) -> np.ndarray:
-        return self._model.predict(np.array([s.data for s in states]))
+        return self._model.predict(np.array([s.data for s in states])).astype(np.float32)
+
+    def _accumulated_fit(
+            self, state_data: np.ndarray, targets: np.ndarray, masks: np.ndarray
+        ) -> float:
+        """
+        # Arguments
+            state_data: np.ndarray. Prepared states.
+            targets: np.ndarray. Prepared targets.
+            masks: np.ndarray. Prepared masks.
+        # Returns the mean loss of the gradient steps, weighted by their numbers of samples,
+            like the one reported by `fit` of Keras.
+        """
+        step_size = self.fit_batch_size or len(state_data)
+        losses = []
+        sizes = []
+        for start in range(0, len(state_data), step_size):
+            step = slice(start, start + step_size)
+            losses.append(float(self._accumulated_step(
+                state_data[step].astype(np.float32),
+                targets[step].astype(np.float32),
+                masks[step].astype(np.float32)
+            )))
+            sizes.append(len(state_data[step]))
+        return float(np.average(losses, weights=sizes))
+
+    def _accumulate(self, state_data: tf.Tensor, targets: tf.Tensor, masks: tf.Tensor) -> tf.Tensor:
+        """
+        One gradient step over all the given samples, with a single optimizer update.
+        The gradients are accumulated in graph over micro-batches, only the activations of
+            one micro-batch are kept at once, and the update matches the one of a single step
+            of the learning model over the same samples (up to the order of float additions).
+        # Arguments
+            state_data: tf.Tensor. States of the step.
+            targets: tf.Tensor. Targets of the step.
+            masks: tf.Tensor. Masks of the step.
+        # Returns the loss of the step.
+        """
+        samples_count = tf.shape(state_data)[0]
+        size = tf.cast(samples_count, tf.float32)
+        variables = self._model.trainable_variables
+        gradients = [tf.zeros_like(variable) for variable in variables]
+        loss = tf.constant(0.0)
+        for start in tf.range(0, samples_count, self.micro_batch_size):
+            micro_batch = slice(start, tf.minimum(start + self.micro_batch_size, samples_count))
+            with tf.GradientTape() as tape:
+                y_pred = self._model(state_data[micro_batch], training=True)
+                errors = self._clipped_masked_error(
+                    [targets[micro_batch], y_pred, masks[micro_batch]]
+                )
+                # Scaled so that the micro-batches add up to the mean loss of the whole step
+                micro_loss = tf.reduce_sum(errors) / size
+                if self._model.losses:
+                    micro_size = tf.cast(tf.shape(errors)[0], tf.float32)
+                    micro_loss += tf.add_n(self._model.losses) * micro_size / size
+            optimizer = self._learning_model.optimizer
+            if isinstance(optimizer, LossScaleOptimizer):
+                micro_gradients = optimizer.get_unscaled_gradients(
+                    tape.gradient(optimizer.get_scaled_loss(micro_loss), variables)
+                )
+            else:
+                micro_gradients = tape.gradient(micro_loss, variables)
+            gradients = [g + m for g, m in zip(gradients, micro_gradients)]
+            loss += micro_loss
+        self._learning_model.optimizer.apply_gradients(zip(gradients, variables))
+        return loss
+
+    @staticmethod
+    def _variables_size(variables: list) -> int:
+        """
+        # Arguments
+            variables: list. TensorFlow variables.
+        # Returns the total size of the variables in bytes.
+        """
+        return sum(int(np.prod(v.shape)) * v.dtype.size for v in variables)
+
+    @staticmethod
+    def _create_model(
+            model_builder: Callable[[int], Model], output_size: int, precision: str
+        ) -> Model:
+        """
+        # Arguments
+            model_builder: Callable[[int], Model]. Takes output size as param and returns model.
+            output_size: int. Output size.
+            precision: str. Precision policy of the layers.
+        # Returns the model, with its layers built under the precision policy.
+        """
+        # Layers take the global policy when they are created, which is restored right after
+        # so that the learning model (and the loss) stays in float32
+        policy = global_policy()
+        set_global_policy(precision)
+        try:
+            return model_builder(output_size)
+        finally:
+            set_global_policy(policy)
 
     def _create_learning_model(self, model: Model, output_size: int, optimizer: Optimizer) -> Model:
         """
@@ -100,6 +281,8 @@ class Quality(BaseQuality):
         See https://github.com/keras-rl/keras-rl/blob/master/rl/agents/dqn.py
         """
         y_true, y_pred, mask = args
+        # Reduced precision outputs are compared in float32
+        y_pred = K.cast(y_pred, "float32")
         loss = self._huber_loss(y_true, y_pred, self.delta_clip)
         loss *= mask
         return K.sum(loss, axis=-1)
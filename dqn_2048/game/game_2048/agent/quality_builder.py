@@ -2,14 +2,18 @@
 Quality builder
 """
 
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
 
 import numpy as np
-from tensorflow.keras import Model
-from tensorflow.keras.optimizers import Optimizer
 
 from ...base import QualityBuilder as BaseQualityBuilder
-from .quality import Quality
+
+if TYPE_CHECKING:
+    # TensorFlow is only needed once a quality is actually built, see `build`
+    from tensorflow import distribute
+    from tensorflow.keras import Model
+    from tensorflow.keras.optimizers import Optimizer
+    from .quality import Quality
 
 class QualityBuilder(BaseQualityBuilder):
     """
@@ -22,6 +26,10 @@ class QualityBuilder(BaseQualityBuilder):
         self.model_builder = None
         self.optimizer = None
         self.delta_clip = np.inf
+        self.fit_batch_size = None
+        self.strategy = None
+        self.micro_batch_size = None
+        self.precision = "float32"
 
     def set_gamma(self, gamma: float):
         """
@@ -39,7 +47,7 @@ class QualityBuilder(BaseQualityBuilder):
         self.output_size = output_size
         return self
 
-    def set_model_builder(self, model_builder: Callable[[int], Model]):
+    def set_model_builder(self, model_builder: Callable[[int], "Model"]):
         """
         # Arguments
             model_builder: Callable[[int], Model]. Model builder.
@@ -47,7 +55,7 @@ class QualityBuilder(BaseQualityBuilder):
         self.model_builder = model_builder
         return self
 
-    def set_optimizer(self, optimizer: Optimizer):
+    def set_optimizer(self, optimizer: "Optimizer"):
         """
         # Arguments
             optimizer: Optimizer. Optimizer.
@@ -63,9 +71,49 @@ class QualityBuilder(BaseQualityBuilder):
         self.delta_clip = delta_clip
         return self
 
-    def build(self) -> Quality:
+    def set_fit_batch_size(self, fit_batch_size: int):
+        """
+        # Arguments
+            fit_batch_size: int. Size of the gradient steps a learned batch is split into.
+        """
+        self.fit_batch_size = fit_batch_size
+        return self
+
+    def set_strategy(self, strategy: "distribute.Strategy"):
+        """
+        # Arguments
+            strategy: distribute.Strategy. Distribution strategy the models are built under.
+        """
+        self.strategy = strategy
+        return self
+
+    def set_micro_batch_size(self, micro_batch_size: int):
+        """
+        # Arguments
+            micro_batch_size: int. Size of the micro-batches a gradient step accumulates,
+                `None` to compute every gradient step at once.
+        """
+        self.micro_batch_size = micro_batch_size
+        return self
+
+    def set_precision(self, precision: str):
+        """
+        # Arguments
+            precision: str. Precision policy of the model,
+                "float32", "mixed_bfloat16" or "mixed_float16".
+        """
+        self.precision = precision
+        return self
+
+    def build(self) -> "Quality":
+        # Import lazily so that building the environment side never pulls in TensorFlow
+        from .quality import Quality
         return Quality(
             self.gamma, self.output_size,
             self.model_builder, self.optimizer,
-            delta_clip=self.delta_clip
+            delta_clip=self.delta_clip,
+            fit_batch_size=self.fit_batch_size,
+            strategy=self.strategy,
+            micro_batch_size=self.micro_batch_size,
+            precision=self.precision
         )
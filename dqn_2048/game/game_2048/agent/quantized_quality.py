@@ -0,0 +1,147 @@
+"""
+Quantized quality
+"""
+
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from ...base import InferenceQuality
+from ..environment.state import State
+
+class QuantizedQuality(InferenceQuality):
+    """
+    Quantized quality. Inference-only NumPy copy of a dense ReLU network,
+        with weights quantized after training to int8 (symmetric, one scale per output channel)
+        or float16. Biases are kept in float32.
+    The quantized weights are what is saved and shipped (4x or 2x smaller than float32),
+        and inference computes with them as they are:
+        - float16: activations and weights are multiplied in float16,
+        - int8: activations are quantized to int8 too (symmetric, one scale per board),
+            multiplied with the weights in int32 accumulators, then rescaled to float32.
+    NumPy only has BLAS kernels for floats of 32 and 64 bits, so on CPU these products are
+        much slower than float32, see `quantize.py` for the measured throughputs.
+    """
+
+    PRECISIONS = ("float32", "float16", "int8")
+
+    def __init__(self, gamma: float, output_size: int, precision: str = "int8"):
+        """
+        # Arguments
+            gamma: float. Gamma.
+            output_size: int. Output size of the model.
+            precision: str. One of "float32", "float16" or "int8".
+        """
+        super().__init__(gamma, output_size)
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"precision must be one of {self.PRECISIONS}, got {precision!r}")
+        self.precision = precision
+        self._quantized: List[np.ndarray] = []
+        # (kernel, scales of the int8 kernel or `None`, bias) of each layer
+        self._layers: List[tuple] = []
+
+    def copied(self, training_quality: InferenceQuality):
+        """
+        Quantize the weights of a trained quality.
+        # Arguments
+            training_quality: InferenceQuality. Quality exposing `weights`
+                as [kernel, bias, kernel, ...].
+        """
+        self._quantized = []
+        weights = training_quality.weights
+        for kernel, bias in zip(weights[::2], weights[1::2]):
+            self._quantized.extend(self._quantize(kernel))
+            self._quantized.append(bias.astype(np.float32))
+        self._create_layers()
+
+    def snapshot(self) -> List[np.ndarray]:
+        return list(self._quantized)
+
+    def restored(self, snapshot: List[np.ndarray]):
+        self._quantized = list(snapshot)
+        self._create_layers()
+
+    def save(self, dir_path: str):
+        np.savez(
+            os.path.join(dir_path, f"last.{self.precision}.npz"),
+            *self._quantized
+        )
+
+    def load(self, dir_path: str):
+        with np.load(os.path.join(dir_path, f"last.{self.precision}.npz")) as arrays:
+            self._quantized = [arrays[f"arr_{i}"] for i in range(len(arrays.files))]
+        self._create_layers()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        # Returns the size of the quantized parameters in bytes.
+        """
+        return sum(array.nbytes for array in self._quantized)
+
+    def memory(self) -> Dict[str, int]:
+        return {
+            "parameters": self.nbytes,
+            "layers": sum(
+                array.nbytes for layer in self._layers for array in layer if array is not None
+            ),
+        }
+
+    def _predict(self, states: List[State]) -> np.ndarray:
+        outputs = np.array([s.data for s in states], dtype=np.float32)
+        if self.precision == "float16":
+            outputs = outputs.astype(np.float16)
+        for i, (kernel, scales, bias) in enumerate(self._layers):
+            if scales is None:
+                outputs = outputs @ kernel
+            else:
+                outputs = self._multiplied(outputs, kernel, scales)
+            outputs += bias
+            if i < len(self._layers) - 1:
+                np.maximum(outputs, 0, out=outputs)
+        return outputs.astype(np.float32)
+
+    @staticmethod
+    def _multiplied(inputs: np.ndarray, kernel: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        """
+        # Arguments
+            inputs: np.ndarray. Float32 activations of shape (count, inputs).
+            kernel: np.ndarray. Int8 kernel of shape (inputs, outputs).
+            scales: np.ndarray. Float32 scales of the kernel, one per output channel.
+        # Returns the float32 product of the activations quantized to int8 and the kernel.
+        """
+        input_scales = np.abs(inputs).max(axis=1, keepdims=True) / 127
+        input_scales[input_scales == 0] = 1.0
+        quantized = np.rint(inputs / input_scales).astype(np.int8)
+        # At most 127 * 127 * inputs, far from overflowing int32
+        accumulated = np.matmul(quantized, kernel, dtype=np.int32)
+        return accumulated.astype(np.float32) * (input_scales * scales)
+
+    def _quantize(self, kernel: np.ndarray) -> List[np.ndarray]:
+        """
+        # Arguments
+            kernel: np.ndarray. Float32 kernel of shape (inputs, outputs).
+        # Returns the quantized kernel, followed by its per-channel scales for int8.
+        """
+        if self.precision == "float32":
+            return [kernel.astype(np.float32)]
+        if self.precision == "float16":
+            return [kernel.astype(np.float16)]
+        scales = np.abs(kernel).max(axis=0) / 127
+        scales[scales == 0] = 1.0
+        quantized = np.clip(np.round(kernel / scales), -127, 127).astype(np.int8)
+        return [quantized, scales.astype(np.float32)]
+
+    def _create_layers(self):
+        """
+        Groups the quantized parameters into layers used for inference, without expanding them.
+        """
+        arrays = iter(self._quantized)
+        self._layers = []
+        for kernel in arrays:
+            scales = next(arrays) if self.precision == "int8" else None
+            bias = next(arrays)
+            if self.precision == "float16":
+                bias = bias.astype(np.float16)
+            self._layers.append((kernel, scales, bias))
@@ -0,0 +1,179 @@
+"""
+Tuple quality
+"""
+
+import os
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ...base import Quality as BaseQuality, Experience
+from ..environment.direction import Direction
+from ..environment.engine import Engine, pack
+from ..environment.state import State
+
+class TupleQuality(BaseQuality):
+    """
+    Tuple quality. An n-tuple network, learning much faster per CPU-second than a dense model.
+    The value of a board is the sum, over every tuple of cells and every symmetry of the board
+        (4 rotations, mirrored or not), of a lookup in the table of the tuple,
+        indexed by the tile exponents of its cells.
+    Actions are valued through their afterstates, i.e. the boards right after collapsing,
+        before a new tile is seeded: Q(s, a) = r(s, a) + V(afterstate(s, a)).
+    The tables are learned with TD(0) updates of the afterstate values.
+    """
+
+    # Value of the actions which do not change the board, never selected over a changing one
+    _ILLEGAL_VALUE: float = -1e6
+
+    def __init__(
+            self,
+            gamma: float, output_size: int,
+            size: int, tuples: Sequence[Sequence[Tuple[int, int]]],
+            learning_rate: float, max_exponent: int = 15
+        ):
+        """
+        # Arguments
+            gamma: float. Gamma.
+            output_size: int. Size of the action output space, must be the number of directions.
+            size: int. The size of the boards.
+            tuples: Sequence[Sequence[Tuple[int, int]]]. Cells (row, column) of each tuple.
+            learning_rate: float. Step size of an update of the whole value,
+                shared by all the looked up weights.
+            max_exponent: int = 15. Larger tile exponents are looked up as this one,
+                every table has `(max_exponent + 1) ** len(tuple)` weights.
+        """
+        if output_size != len(Direction):
+            raise ValueError(f"output_size must be {len(Direction)}, got {output_size}")
+        super().__init__(gamma, output_size)
+        self.size = size
+        self.learning_rate = learning_rate
+        self.max_exponent = max_exponent
+        # Flat indices of the cells of each tuple, under each symmetry: (symmetries, length)
+        self._cells = [self._symmetric_cells(cells, size) for cells in tuples]
+        self._tables = [
+            np.zeros((max_exponent + 1) ** cells.shape[1], dtype=np.float32)
+            for cells in self._cells
+        ]
+        self._lookups_count = sum(len(cells) for cells in self._cells)
+
+    def prepare(self, batch: List[Experience]) -> Tuple[List[np.ndarray], np.ndarray]:
+        states = [experience.state for experience in batch]
+        actions = np.array([experience.action.data for experience in batch])
+        values = np.array([experience.value for experience in batch])
+        afterstates, rewards, is_changed = self._afterstates(states)
+        rows = np.arange(len(batch))
+        # Actions which do not change the board have no afterstate to be learned
+        is_changed = is_changed[rows, actions]
+        afterstates = afterstates[rows, actions][is_changed]
+        # V(afterstate(s, a)) is learned towards the target of Q(s, a) without its reward
+        targets = (values - rewards[rows, actions])[is_changed]
+        return (self._indices(afterstates), targets)
+
+    def fit(self, prepared_batch: Tuple[List[np.ndarray], np.ndarray]) -> float:
+        indices, targets = prepared_batch
+        if len(targets) == 0:
+            return 0.0
+        errors = targets - self._lookup(indices)
+        steps = self.learning_rate / self._lookups_count * errors
+        for table, table_indices in zip(self._tables, indices):
+            # A weight looked up many times in the batch, e.g. of early boards, is moved by
+            # the mean of its steps, otherwise their sum would overshoot and diverge
+            unique_indices, inverse = np.unique(table_indices, return_inverse=True)
+            step_sums = np.bincount(
+                inverse.ravel(), weights=np.repeat(steps, table_indices.shape[1])
+            )
+            table[unique_indices] += step_sums / np.bincount(inverse.ravel())
+        return float(np.mean(0.5 * errors ** 2))
+
+    def copied(self, training_quality: "TupleQuality"):
+        self.restored(training_quality.snapshot())
+
+    def snapshot(self) -> List[np.ndarray]:
+        return [table.copy() for table in self._tables]
+
+    def restored(self, snapshot: List[np.ndarray]):
+        for table, weights in zip(self._tables, snapshot):
+            np.copyto(table, weights)
+
+    def save(self, dir_path: str):
+        np.savez_compressed(
+            os.path.join(dir_path, "last.tuples.npz"),
+            **{f"table_{i}": table for i, table in enumerate(self._tables)},
+            **{f"cells_{i}": cells for i, cells in enumerate(self._cells)}
+        )
+
+    def load(self, dir_path: str):
+        with np.load(os.path.join(dir_path, "last.tuples.npz")) as data:
+            for i, cells in enumerate(self._cells):
+                if not np.array_equal(data[f"cells_{i}"], cells):
+                    raise ValueError(f"Tuple {i} of the saved model does not match")
+            self.restored([data[f"table_{i}"] for i in range(len(self._tables))])
+
+    def memory(self) -> Dict[str, int]:
+        return {"parameters": sum(table.nbytes for table in self._tables)}
+
+    def _predict(self, states: List[State]) -> np.ndarray:
+        afterstates, rewards, is_changed = self._afterstates(states)
+        values = self._lookup(self._indices(afterstates.reshape(-1, self.size, self.size)))
+        values = rewards + values.reshape(len(states), self.output_size)
+        values[~is_changed] = self._ILLEGAL_VALUE
+        return values
+
+    def _afterstates(self, states: List[State]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        # Arguments
+            states: List[State]. List of observed states.
+        # Returns the afterstates of every action as tile exponents, their rewards
+            normalized like `State.executed`, and the flags of changed boards.
+        """
+        unit = states[0].unit
+        afterstates, merged_values, is_changed = Engine.afterstates(pack(states, unit), unit)
+        rewards = np.zeros(merged_values.shape)
+        is_merged = merged_values > 0
+        rewards[is_merged] = np.log(merged_values[is_merged]) / np.log(unit ** self.size ** 2)
+        return (afterstates, rewards, is_changed)
+
+    def _indices(self, boards: np.ndarray) -> List[np.ndarray]:
+        """
+        # Arguments
+            boards: np.ndarray. Boards of tile exponents, of shape (count, size, size).
+        # Returns the looked up indices of each table, of shape (count, symmetries).
+        """
+        boards = np.minimum(boards.reshape(len(boards), -1), self.max_exponent).astype(np.int64)
+        indices = []
+        for cells in self._cells:
+            powers = (self.max_exponent + 1) ** np.arange(cells.shape[1])
+            indices.append(boards[:, cells] @ powers)
+        return indices
+
+    def _lookup(self, indices: List[np.ndarray]) -> np.ndarray:
+        """
+        # Arguments
+            indices: List[np.ndarray]. Indices returned by `_indices`.
+        # Returns the value of each board.
+        """
+        return sum(
+            table[table_indices].sum(axis=1, dtype=np.float64)
+            for table, table_indices in zip(self._tables, indices)
+        )
+
+    @staticmethod
+    def _symmetric_cells(cells: Sequence[Tuple[int, int]], size: int) -> np.ndarray:
+        """
+        # Arguments
+            cells: Sequence[Tuple[int, int]]. Cells (row, column) of a tuple.
+            size: int. The size of the boards.
+        # Returns the flat indices of the cells under the 8 symmetries of the board,
+            of shape (8, len(cells)).
+        """
+        rows, columns = np.array(cells).T
+        if rows.min() < 0 or columns.min() < 0 or max(rows.max(), columns.max()) >= size:
+            raise ValueError(f"Tuple {cells} does not fit in a {size}x{size} board")
+        last = size - 1
+        symmetries = []
+        for _ in range(4):
+            rows, columns = columns, last - rows # Rotated clockwise
+            symmetries.append(rows * size + columns)
+            symmetries.append(rows * size + last - columns) # Mirrored
+        return np.array(symmetries)
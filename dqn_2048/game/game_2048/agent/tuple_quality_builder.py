@@ -0,0 +1,76 @@
+"""
+Tuple quality builder
+"""
+
+from typing import List, Sequence, Tuple
+
+from ...base import QualityBuilder as BaseQualityBuilder
+from .tuple_quality import TupleQuality
+
+class TupleQualityBuilder(BaseQualityBuilder):
+    """
+    Tuple quality builder
+    """
+
+    def __init__(self):
+        self.gamma = 0.0
+        self.output_size = 0
+        self.size = 0
+        self.tuples: List[Sequence[Tuple[int, int]]] = []
+        self.learning_rate = 0.0
+        self.max_exponent = 15
+
+    def set_gamma(self, gamma: float):
+        """
+        # Arguments
+            gamma: float. The discount factor, used for Bellman approximation.
+        """
+        self.gamma = gamma
+        return self
+
+    def set_output_size(self, output_size: int):
+        """
+        # Arguments
+            output_size: int. Size of the action output space.
+        """
+        self.output_size = output_size
+        return self
+
+    def set_size(self, size: int):
+        """
+        # Arguments
+            size: int. The size of the boards.
+        """
+        self.size = size
+        return self
+
+    def set_tuples(self, tuples: List[Sequence[Tuple[int, int]]]):
+        """
+        # Arguments
+            tuples: List[Sequence[Tuple[int, int]]]. Cells (row, column) of each tuple.
+        """
+        self.tuples = tuples
+        return self
+
+    def set_learning_rate(self, learning_rate: float):
+        """
+        # Arguments
+            learning_rate: float. Step size of an update of the whole value.
+        """
+        self.learning_rate = learning_rate
+        return self
+
+    def set_max_exponent(self, max_exponent: int):
+        """
+        # Arguments
+            max_exponent: int. Largest tile exponent told apart by the tables.
+        """
+        self.max_exponent = max_exponent
+        return self
+
+    def build(self) -> TupleQuality:
+        return TupleQuality(
+            self.gamma, self.output_size,
+            self.size, self.tuples, self.learning_rate,
+            max_exponent=self.max_exponent
+        )
@@ -0,0 +1,130 @@
+"""
+Reader
+"""
+
+import os
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from ...base import Action, Transition
+from ..environment.engine import unpack
+from .recorder import read_index
+
+class Reader:
+    """
+    Reader. Streams shuffled batches of transitions out of the chunks written by `Recorder`.
+    Chunks are read one at a time in random order, and transitions are shuffled
+        through a bounded buffer, so memory does not grow with the size of the dataset.
+    """
+
+    def __init__(
+            self,
+            dir_path: str,
+            batch_size: int,
+            shuffle_size: int = 200000,
+            seed: int = None
+        ):
+        """
+        # Arguments
+            dir_path: str. Directory of the chunks.
+            batch_size: int. The number of transitions per batch.
+            shuffle_size: int. The number of transitions buffered for shuffling.
+            seed: int = None. Seed of the random generator used for shuffling.
+        """
+        self.dir_path = dir_path
+        self.batch_size = batch_size
+        self.shuffle_size = shuffle_size
+        self._random = np.random.default_rng(seed)
+
+    @property
+    def transitions_count(self) -> int:
+        """
+        # Returns the number of recorded transitions.
+        """
+        return sum(chunk["transitions"] for chunk in read_index(self.dir_path))
+
+    def batches(self, epochs_count: int = 1) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        # Arguments
+            epochs_count: int. The number of passes over the dataset, `0` to repeat forever.
+        # Returns iterator of batches, each one with the arrays
+            "old_boards", "actions", "rewards", "boards" and "dones".
+        """
+        buffer = None
+        epoch = 0
+        while epochs_count == 0 or epoch < epochs_count:
+            index = read_index(self.dir_path)
+            if not index:
+                return
+            for chunk_index in self._random.permutation(len(index)):
+                chunk = self._read_chunk(index[chunk_index]["file"])
+                buffer = chunk if buffer is None else {
+                    name: np.concatenate([buffer[name], chunk[name]]) for name in buffer
+                }
+                if len(buffer["actions"]) >= self.shuffle_size:
+                    # Emit half of the shuffled buffer, the other half mixes with next chunks
+                    buffer = self._shuffled(buffer)
+                    kept_count = self.shuffle_size // 2
+                    emitted_count = len(buffer["actions"]) - kept_count
+                    emitted_count -= emitted_count % self.batch_size
+                    yield from self._split({n: a[:emitted_count] for n, a in buffer.items()})
+                    buffer = {name: array[emitted_count:] for name, array in buffer.items()}
+            epoch += 1
+        if buffer is not None:
+            yield from self._split(self._shuffled(buffer))
+
+    def transition_batches(self, unit: int, epochs_count: int = 1) -> Iterator[List[Transition]]:
+        """
+        # Arguments
+            unit: int. Unit value for tile.
+            epochs_count: int. The number of passes over the dataset, `0` to repeat forever.
+        # Returns iterator of batches of transitions between list-based states,
+            ready for `Quality.calculate`.
+        """
+        for batch in self.batches(epochs_count):
+            old_states = unpack(batch["old_boards"], unit)
+            states = unpack(batch["boards"], unit)
+            yield [
+                Transition(old_state, Action(int(action)), float(reward), state)
+                for old_state, action, reward, state
+                in zip(old_states, batch["actions"], batch["rewards"], states)
+            ]
+
+    def _read_chunk(self, file_name: str) -> Dict[str, np.ndarray]:
+        """
+        # Arguments
+            file_name: str. File name of the chunk.
+        # Returns the transitions of the chunk.
+        """
+        with np.load(os.path.join(self.dir_path, file_name)) as chunk:
+            boards = chunk["boards"]
+            offsets = chunk["episode_offsets"]
+            lengths = np.diff(offsets)
+            # Each episode has one more board than transitions
+            old_indices = np.arange(offsets[-1]) + np.repeat(np.arange(len(lengths)), lengths)
+            return {
+                "old_boards": boards[old_indices],
+                "actions": chunk["actions"],
+                "rewards": chunk["rewards"],
+                "boards": boards[old_indices + 1],
+                "dones": chunk["dones"],
+            }
+
+    def _shuffled(self, buffer: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        # Arguments
+            buffer: Dict[str, np.ndarray]. Buffered transitions.
+        # Returns the buffered transitions in random order.
+        """
+        order = self._random.permutation(len(buffer["actions"]))
+        return {name: array[order] for name, array in buffer.items()}
+
+    def _split(self, buffer: Dict[str, np.ndarray]) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        # Arguments
+            buffer: Dict[str, np.ndarray]. Buffered transitions.
+        # Returns iterator of batches, the last one may be smaller.
+        """
+        for start in range(0, len(buffer["actions"]), self.batch_size):
+            yield {name: array[start:start + self.batch_size] for name, array in buffer.items()}
@@ -0,0 +1,140 @@
+"""
+Recorder
+"""
+
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from ...base import Recorder as BaseRecorder
+from ...base import Transition
+from ..environment.engine import pack
+
+INDEX_FILE_NAME = "index.json"
+
+class Recorder(BaseRecorder):
+    """
+    Recorder. Appends episodes to chunked, compressed NumPy files.
+    Each chunk stores, for the episodes it contains:
+        boards: uint8 tile exponents of every visited state, `length + 1` boards per episode.
+        actions: uint8 index of the direction of every transition.
+        rewards: float32 reward of every transition.
+        dones: bool flag of every transition, set when its next state is ended.
+        episode_offsets: int64 offsets of the first transition of every episode,
+            followed by the total number of transitions.
+    The index file lists the chunks with their numbers of episodes and transitions.
+    An episode is closed when it ends, or when a recorded transition does not continue it,
+        e.g. because the environment has been reset (the episode is then truncated).
+    """
+
+    def __init__(self, dir_path: str, unit: int, chunk_size: int = 100000):
+        """
+        # Arguments
+            dir_path: str. Directory of the chunks, recording resumes after existing chunks.
+            unit: int. Unit value for tile.
+            chunk_size: int. The number of transitions from which a chunk is written.
+        """
+        self.dir_path = dir_path
+        self.unit = unit
+        self.chunk_size = chunk_size
+        os.makedirs(dir_path, exist_ok=True)
+        self._index = read_index(dir_path)
+        self._episode: List[Transition] = []
+        # Closed episodes are packed right away, only the current one is kept as transitions
+        self._chunk: Dict[str, List[np.ndarray]] = self._create_chunk()
+        self._transitions_count = 0
+
+    def record(self, transition: Transition):
+        if self._episode and self._episode[-1].state != transition.old_state:
+            self._closed_episode()
+        self._episode.append(transition)
+        if transition.state.is_ended():
+            self._closed_episode()
+
+    def close(self):
+        self._closed_episode()
+        self._written_chunk()
+
+    def record_episode(
+            self,
+            boards: np.ndarray, actions: np.ndarray, rewards: np.ndarray, dones: np.ndarray
+        ):
+        """
+        Appends an already packed episode, e.g. played by `Engine`, writing the chunk once full.
+        # Arguments
+            boards: np.ndarray. Tile exponents of every visited state, of shape
+                (length + 1, size, size).
+            actions: np.ndarray. Index of the direction of every transition.
+            rewards: np.ndarray. Reward of every transition.
+            dones: np.ndarray. Flag of every transition, set when its next state is ended.
+        """
+        self._chunk["boards"].append(boards.astype(np.uint8))
+        self._chunk["actions"].append(actions.astype(np.uint8))
+        self._chunk["rewards"].append(rewards.astype(np.float32))
+        self._chunk["dones"].append(dones.astype(bool))
+        self._transitions_count += len(actions)
+        if self._transitions_count >= self.chunk_size:
+            self._written_chunk()
+
+    def _closed_episode(self):
+        """
+        Packs the current episode into the pending chunk.
+        """
+        if not self._episode:
+            return
+        episode = self._episode
+        self._episode = []
+        boards = [transition.old_state for transition in episode] + [episode[-1].state]
+        self.record_episode(
+            pack(boards, self.unit),
+            np.array([t.action.data for t in episode]),
+            np.array([t.reward for t in episode]),
+            np.array([t.state.is_ended() for t in episode])
+        )
+
+    def _written_chunk(self):
+        """
+        Writes pending episodes to a new chunk, then updates the index.
+        """
+        if not self._chunk["actions"]:
+            return
+        lengths = [len(actions) for actions in self._chunk["actions"]]
+        file_name = f"chunk_{len(self._index):06d}.npz"
+        np.savez_compressed(
+            os.path.join(self.dir_path, file_name),
+            episode_offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            **{name: np.concatenate(arrays) for name, arrays in self._chunk.items()}
+        )
+        self._index.append({
+            "file": file_name,
+            "episodes": len(lengths),
+            "transitions": sum(lengths),
+        })
+        # Write the index atomically so that readers never see a partial one
+        temporary_path = os.path.join(self.dir_path, INDEX_FILE_NAME + ".tmp")
+        with open(temporary_path, "w") as index_file:
+            json.dump(self._index, index_file, indent=2)
+        os.replace(temporary_path, os.path.join(self.dir_path, INDEX_FILE_NAME))
+        self._chunk = self._create_chunk()
+        self._transitions_count = 0
+
+    @staticmethod
+    def _create_chunk() -> Dict[str, List[np.ndarray]]:
+        """
+        # Returns new empty pending chunk.
+        """
+        return {"boards": [], "actions": [], "rewards": [], "dones": []}
+
+def read_index(dir_path: str) -> List[Dict]:
+    """
+    # Arguments
+        dir_path: str. Directory of the chunks.
+    # Returns the list of chunks, empty if nothing has been recorded yet.
+    """
+    index_path = os.path.join(dir_path, INDEX_FILE_NAME)
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path) as index_file:
+        return json.load(index_file)
@@ -0,0 +1,146 @@
+"""
+Warmup
+"""
+
+import os
+import shutil
+from math import ceil
+from tempfile import mkdtemp
+from typing import List
+
+import numpy as np
+
+from ...base import Transition
+from ..environment.direction import Direction
+from ..environment.engine import Engine
+from .reader import Reader
+from .recorder import Recorder
+
+class Warmup:
+    """
+    Warmup. Random-policy transitions filling the transition buffer before learning starts.
+    They are played in bulk by `Engine`, then kept on disk in the format of `Recorder`,
+        so that every following run with the same settings only reads them back.
+    A dataset is written to a temporary directory then renamed into place, and never changed
+        afterwards, so that concurrent runs (e.g. the trials of a sweep) can share the cache.
+    """
+
+    _DATASET_PREFIX: str = "transitions_"
+
+    def __init__(
+            self,
+            dir_path: str, size: int, unit: int, seed: int = 0,
+            boards_count: int = 1000, burn_in_steps_count: int = 500
+        ):
+        """
+        # Arguments
+            dir_path: str. Directory of the cached datasets, one sub-directory per key.
+            size: int. The size of the boards.
+            unit: int. Unit value for tile.
+            seed: int = 0. Seed of the random play.
+            boards_count: int = 1000. The number of boards played at once.
+            burn_in_steps_count: int = 500. The number of steps played before recording,
+                longer than most random games so that the boards are spread over all stages
+                of the game, like the positions of a single board played for long.
+        """
+        self.size = size
+        self.unit = unit
+        self.seed = seed
+        self.boards_count = boards_count
+        self.burn_in_steps_count = burn_in_steps_count
+        # Every setting of the random play is part of the key
+        self.key_path = os.path.join(
+            dir_path,
+            f"size_{size}_unit_{unit}_seed_{seed}"
+            f"_boards_{boards_count}_burn_in_{burn_in_steps_count}"
+        )
+
+    def transitions(self, transitions_count: int) -> List[Transition]:
+        """
+        # Arguments
+            transitions_count: int. The number of transitions.
+        # Returns random-policy transitions between list-based states,
+            played and cached first if the cached dataset is missing or too small.
+        """
+        dataset_path = self._find(transitions_count) or self._played(transitions_count)
+        reader = Reader(dataset_path, transitions_count, seed=self.seed)
+        transitions = []
+        for batch in reader.transition_batches(self.unit):
+            transitions += batch[:transitions_count - len(transitions)]
+            if len(transitions) == transitions_count:
+                break
+        return transitions
+
+    def _find(self, transitions_count: int) -> str:
+        """
+        # Arguments
+            transitions_count: int. The minimum number of transitions.
+        # Returns the path of the smallest cached dataset large enough, `None` if there is none.
+        """
+        if not os.path.isdir(self.key_path):
+            return None
+        sizes = [
+            int(name[len(self._DATASET_PREFIX):]) for name in os.listdir(self.key_path)
+            if name.startswith(self._DATASET_PREFIX)
+        ]
+        sizes = [size for size in sizes if size >= transitions_count]
+        if not sizes:
+            return None
+        return os.path.join(self.key_path, f"{self._DATASET_PREFIX}{min(sizes)}")
+
+    def _played(self, transitions_count: int) -> str:
+        """
+        Plays random actions on all boards at once, then records each board's episodes,
+            the first and the last ones of each board being truncated.
+        # Arguments
+            transitions_count: int. The minimum number of transitions.
+        # Returns the path of the new dataset.
+        """
+        os.makedirs(self.key_path, exist_ok=True)
+        temporary_path = mkdtemp(prefix=".playing_", dir=self.key_path)
+        # Independent streams for the seeded tiles and the actions
+        engine_seed, actions_seed = np.random.SeedSequence(self.seed).spawn(2)
+        engine = Engine(self.size, self.unit, self.boards_count, engine_seed)
+        random = np.random.default_rng(actions_seed)
+        steps_count = ceil(transitions_count / self.boards_count)
+        shape = (steps_count, self.boards_count)
+        old_boards = np.empty(shape + (self.size, self.size), dtype=np.uint8)
+        boards = np.empty_like(old_boards)
+        actions = random.integers(len(Direction), size=shape)
+        rewards = np.empty(shape)
+        dones = np.empty(shape, dtype=bool)
+        for _ in range(self.burn_in_steps_count):
+            engine.executed(random.integers(len(Direction), size=self.boards_count))
+            engine.reset(np.flatnonzero(engine.is_ended()))
+        for step in range(steps_count):
+            old_boards[step] = engine.boards
+            rewards[step], _ = engine.executed(actions[step])
+            boards[step] = engine.boards
+            dones[step] = engine.is_ended()
+            engine.reset(np.flatnonzero(dones[step]))
+        with Recorder(temporary_path, self.unit) as recorder:
+            for board_index in range(self.boards_count):
+                ends = np.flatnonzero(dones[:, board_index]).tolist()
+                if not ends or ends[-1] != steps_count - 1:
+                    ends.append(steps_count - 1)
+                start = 0
+                for end in ends:
+                    episode = slice(start, end + 1)
+                    recorder.record_episode(
+                        np.concatenate([
+                            old_boards[episode, board_index], boards[end:end + 1, board_index]
+                        ]),
+                        actions[episode, board_index],
+                        rewards[episode, board_index],
+                        dones[episode, board_index]
+                    )
+                    start = end + 1
+        dataset_path = os.path.join(self.key_path, f"{self._DATASET_PREFIX}{transitions_count}")
+        try:
+            os.rename(temporary_path, dataset_path)
+        except OSError:
+            # The same dataset has just been played by another run
+            shutil.rmtree(temporary_path, ignore_errors=True)
+            if not os.path.isdir(dataset_path):
+                raise
+        return dataset_path
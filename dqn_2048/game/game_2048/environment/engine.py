@@ -0,0 +1,262 @@
+"""
+Engine
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .direction import Direction
+from .state import State
+
+class Engine:
+    """
+    Engine. Vectorized NumPy boards of any size, played all at once.
+    Tiles are stored as exponents of the unit value (`0` is empty, `k` is `unit ** k`),
+        so that a board of any size fits in `size * size` bytes.
+    Every direction is handled as a left move on a view of the boards
+        (reversed and/or transposed), so no direction-specific code is needed.
+    Rows are still collapsed on copies (sorted, and taken from the boards of each direction),
+        which are written back through the view.
+    """
+
+    def __init__(self, size: int, unit: int, count: int, seed: int = None):
+        """
+        # Arguments
+            size: int. The size of the boards.
+            unit: int. Unit value for tile, other valid values are powers of this unit value.
+            count: int. The number of boards.
+            seed: int = None. Seed of the random generator used for seeding new tiles.
+        """
+        # Tiles, merged values and scores are int64, and a score is less than one merge
+        # of the largest tile per exponent and per spot, e.g. up to 7x7 boards of unit 2
+        if (size ** 2) ** 2 * unit ** (size ** 2) > np.iinfo(np.int64).max:
+            raise ValueError(f"size {size} is too large for int64 scores with unit {unit}")
+        self.size = size
+        self.unit = unit
+        self.count = count
+        self.boards = np.zeros((count, size, size), dtype=np.uint8)
+        self.scores = np.zeros(count, dtype=np.int64)
+        self._random = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self, indices: np.ndarray = None):
+        """
+        Resets boards to their initial state, an empty board with one seeded tile.
+        # Arguments
+            indices: np.ndarray = None. Indices of the boards to be reset, all boards if not given.
+        """
+        indices = np.arange(self.count) if indices is None else np.asarray(indices)
+        self.boards[indices] = 0
+        self.scores[indices] = 0
+        self._seeded(indices)
+
+    def executed(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Executes one action per board, then seeds a new tile on every changed board.
+        # Arguments
+            actions: np.ndarray. Index of the direction of each board.
+        # Returns the rewards, normalized like `State.executed`, and the flags of changed boards.
+        """
+        actions = np.asarray(actions)
+        merged_values = np.zeros(self.count, dtype=np.int64)
+        is_changed = np.zeros(self.count, dtype=bool)
+        for direction in Direction:
+            indices = np.flatnonzero(actions == direction.value)
+            if len(indices) == 0:
+                continue
+            boards = self.boards[indices]
+            merged_values[indices], is_changed[indices] = self._collapsed(
+                boards, direction, self.unit
+            )
+            self.boards[indices] = boards
+        self.scores += merged_values
+        self._seeded(np.flatnonzero(is_changed))
+        rewards = np.zeros(self.count)
+        is_merged = merged_values > 0
+        rewards[is_merged] = np.log(merged_values[is_merged]) / np.log(self._max)
+        return (rewards, is_changed)
+
+    def is_ended(self) -> np.ndarray:
+        """
+        # Returns the flags of boards which are not collapsible anymore.
+        """
+        boards = self.boards
+        is_collapsible = (boards == 0).any(axis=(1, 2))
+        is_collapsible |= (boards[:, :, 1:] == boards[:, :, :-1]).any(axis=(1, 2))
+        is_collapsible |= (boards[:, 1:, :] == boards[:, :-1, :]).any(axis=(1, 2))
+        return ~is_collapsible
+
+    @property
+    def data(self) -> np.ndarray:
+        """
+        # Returns the flattened boards, normalized like `State.data`.
+        """
+        # log(unit ** k) / log(unit ** (size ** 2)) == k / size ** 2
+        return self.boards.reshape(self.count, -1).astype(np.float32) / self.size ** 2
+
+    @property
+    def max_tiles(self) -> np.ndarray:
+        """
+        # Returns the value of the largest tile of each board.
+        """
+        exponents = self.boards.reshape(self.count, -1).max(axis=1).astype(np.int64)
+        return np.where(exponents > 0, self.unit ** exponents, 0)
+
+    def states(self) -> List[State]:
+        """
+        # Returns the boards as list-based states.
+        """
+        states = unpack(self.boards, self.unit)
+        for state, score in zip(states, self.scores):
+            state.score = int(score)
+        return states
+
+    def load(self, states: List[State], indices: np.ndarray = None):
+        """
+        # Arguments
+            states: List[State]. List-based states to be copied into the boards.
+            indices: np.ndarray = None. Indices of the boards to be overwritten,
+                the first `len(states)` boards if not given.
+        """
+        indices = np.arange(len(states)) if indices is None else np.asarray(indices)
+        self.boards[indices] = pack(states, self.unit)
+        self.scores[indices] = [state.score for state in states]
+
+    @classmethod
+    def afterstates(
+            cls, boards: np.ndarray, unit: int
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Collapse boards in every direction, without seeding new tiles.
+        # Arguments
+            boards: np.ndarray. Boards of tile exponents, of shape (count, size, size).
+            unit: int. Unit value for tile.
+        # Returns the collapsed boards of shape (count, len(Direction), size, size),
+            the merged values and the flags of change, both of shape (count, len(Direction)).
+        """
+        afterstates = np.repeat(boards[:, np.newaxis], len(Direction), axis=1)
+        merged_values = np.zeros(afterstates.shape[:2], dtype=np.int64)
+        is_changed = np.zeros(afterstates.shape[:2], dtype=bool)
+        for direction in Direction:
+            # Collapsed in place, through a view of the copies
+            index = direction.value
+            merged_values[:, index], is_changed[:, index] = cls._collapsed(
+                afterstates[:, index], direction, unit
+            )
+        return (afterstates, merged_values, is_changed)
+
+    @property
+    def _max(self) -> int:
+        """
+        # Returns the maximum achievable tile.
+        """
+        return self.unit ** (self.size ** 2)
+
+    @classmethod
+    def _collapsed(
+            cls, boards: np.ndarray, direction: Direction, unit: int
+        ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Collapse boards in place in a given direction.
+        # Arguments
+            boards: np.ndarray. Boards of shape (count, size, size).
+            direction: Direction. Collapsing direction.
+            unit: int. Unit value for tile.
+        # Returns the merged value and the flag of change of each board.
+        """
+        size = boards.shape[-1]
+        view = cls._view(boards, direction)
+        old_view = view.copy()
+        rows = old_view.reshape(-1, size)
+        collapsed_rows, merged_values = cls._collapse(rows, unit)
+        view[...] = collapsed_rows.reshape(view.shape)
+        is_changed = (view != old_view).any(axis=(1, 2))
+        return (merged_values.reshape(len(boards), size).sum(axis=1), is_changed)
+
+    def _seeded(self, indices: np.ndarray):
+        """
+        Seeds a new tile with unit value in a random empty spot of each given board.
+        # Arguments
+            indices: np.ndarray. Indices of the boards to be seeded.
+        """
+        if len(indices) == 0:
+            return
+        flattened_boards = self.boards[indices].reshape(len(indices), -1)
+        # The empty spot with the largest random key is picked, full boards are skipped
+        keys = self._random.random(flattened_boards.shape)
+        keys[flattened_boards != 0] = -1.0
+        spots = keys.argmax(axis=1)
+        is_seedable = keys[np.arange(len(indices)), spots] >= 0
+        flattened_boards[np.arange(len(indices))[is_seedable], spots[is_seedable]] = 1
+        self.boards[indices] = flattened_boards.reshape(-1, self.size, self.size)
+
+    @staticmethod
+    def _view(boards: np.ndarray, direction: Direction) -> np.ndarray:
+        """
+        # Arguments
+            boards: np.ndarray. Boards of shape (count, size, size).
+            direction: Direction. Collapsing direction.
+        # Returns a view of the boards in which the direction is a left move.
+        """
+        if direction == Direction.LEFT:
+            return boards
+        if direction == Direction.RIGHT:
+            return boards[:, :, ::-1]
+        if direction == Direction.UP:
+            return boards.transpose(0, 2, 1)
+        return boards.transpose(0, 2, 1)[:, :, ::-1]
+
+    @staticmethod
+    def _compact(rows: np.ndarray) -> np.ndarray:
+        """
+        # Arguments
+            rows: np.ndarray. Rows of exponents.
+        # Returns the rows with all non-empty tiles slid to the left, keeping their order.
+        """
+        order = np.argsort(rows == 0, axis=1, kind="stable")
+        return np.take_along_axis(rows, order, axis=1)
+
+    @classmethod
+    def _collapse(cls, rows: np.ndarray, unit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Slide and merge all rows to the left at once, with the same rules as `State._collapse`.
+        # Arguments
+            rows: np.ndarray. Rows of exponents, of shape (count, size).
+            unit: int. Unit value for tile.
+        # Returns the collapsed rows and the merged value of each row.
+        """
+        rows = cls._compact(rows)
+        merged_values = np.zeros(len(rows), dtype=np.int64)
+        # Merging a pair empties its right tile, so a merged tile cannot merge again
+        for j in range(rows.shape[1] - 1):
+            is_merging = (rows[:, j] != 0) & (rows[:, j] == rows[:, j + 1])
+            if not is_merging.any():
+                continue
+            rows[is_merging, j] += 1
+            rows[is_merging, j + 1] = 0
+            merged_values[is_merging] += unit ** rows[is_merging, j].astype(np.int64)
+        return (cls._compact(rows), merged_values)
+
+def pack(states: List[State], unit: int) -> np.ndarray:
+    """
+    # Arguments
+        states: List[State]. List-based states.
+        unit: int. Unit value for tile.
+    # Returns the boards as tile exponents, of shape (len(states), size, size).
+    """
+    tiles = np.array([state.board for state in states], dtype=np.float64)
+    boards = np.zeros(tiles.shape, dtype=np.uint8)
+    is_filled = tiles > 0
+    boards[is_filled] = np.rint(np.log(tiles[is_filled]) / np.log(unit))
+    return boards
+
+def unpack(boards: np.ndarray, unit: int) -> List[State]:
+    """
+    # Arguments
+        boards: np.ndarray. Boards of tile exponents, of shape (count, size, size).
+        unit: int. Unit value for tile.
+    # Returns the boards as list-based states.
+    """
+    tiles = np.where(boards > 0, unit ** boards.astype(np.int64), 0)
+    return [State(board=board.tolist(), size=len(board), unit=unit) for board in tiles]
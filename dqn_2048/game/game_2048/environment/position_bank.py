@@ -0,0 +1,49 @@
+"""
+Position bank
+"""
+
+import numpy as np
+
+from ...base import PositionBank as BasePositionBank
+from .engine import pack, unpack
+from .state import State
+
+class PositionBank(BasePositionBank):
+    """
+    Position bank. Boards are kept as tile exponents, `size * size` bytes each.
+    """
+
+    def __init__(self, capacity: int, size: int, unit: int, min_tile: int, seed: int = None):
+        """
+        # Arguments
+            capacity: int. The maximum number of positions kept.
+            size: int. The size of the boards.
+            unit: int. Unit value for tile.
+            min_tile: int. Only boards with a tile at least this large are kept,
+                i.e. mid and late game positions.
+            seed: int = None. Seed of the random generator used for keeping and sampling.
+        """
+        super().__init__(capacity, seed)
+        self.unit = unit
+        self.min_tile = min_tile
+        self._boards = np.zeros((capacity, size, size), dtype=np.uint8)
+        self._scores = np.zeros(capacity, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        # Returns the size of the bank in bytes.
+        """
+        return self._boards.nbytes + self._scores.nbytes
+
+    def _is_admitted(self, state: State) -> bool:
+        return state.max_tile >= self.min_tile and super()._is_admitted(state)
+
+    def _stored(self, index: int, state: State):
+        self._boards[index] = pack([state], self.unit)[0]
+        self._scores[index] = state.score
+
+    def _loaded(self, index: int) -> State:
+        state = unpack(self._boards[index:index + 1], self.unit)[0]
+        state.score = int(self._scores[index])
+        return state
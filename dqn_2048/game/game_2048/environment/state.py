@@ -23,6 +23,8 @@ class State(BaseState):
             size: int = None. The size of the board.
             unit: int = None. Unit value for tile, other valid values are powers of this unit value.
         """
+        # The game score, i.e. the sum of merged values since the last reset
+        self.score = 0
         if board is not None:
             self.size = size or len(board)
             self.unit = unit or min(tile for row in board for tile in row if tile != self._EMPTY)
@@ -44,11 +46,13 @@ class State(BaseState):
         ])
 
     def reset(self):
+        self.score = 0
         self._cleared()
         self._seeded()
 
     def executed(self, action: Action) -> float:
         is_changed, total_merged_value = self._collapsed(Direction(action.data))
+        self.score += total_merged_value
         if is_changed:
             self._seeded()
         return 0 if total_merged_value == 0 else log(total_merged_value) / log(self._max)
@@ -56,6 +60,20 @@ class State(BaseState):
     def is_ended(self):
         return not self._is_collapsible()
 
+    @property
+    def board(self) -> List[List[int]]:
+        """
+        # Returns a copy of the board.
+        """
+        return [row[:] for row in self._board]
+
+    @property
+    def max_tile(self) -> int:
+        """
+        # Returns the value of the largest tile on the board.
+        """
+        return max(tile for row in self._board for tile in row)
+
     @property
     def data(self) -> List[float]:
         """
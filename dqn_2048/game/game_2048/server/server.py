@@ -0,0 +1,48 @@
+"""
+Server
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from ...base import Server as BaseServer
+from ...base import Batcher
+from ..environment.direction import Direction
+from ..environment.state import State
+
+class Server(BaseServer):
+    """
+    Server. Recommends moves for 2048 boards.
+    # Examples
+        request:    {"board": [[0, 2, 0, 0], [0, 0, 0, 0], [0, 0, 4, 0], [0, 0, 0, 2]]}
+        response:   {"direction": "LEFT", "values": [0.12, 0.08, 0.05, 0.31]}
+    """
+
+    def __init__(self, batcher: Batcher, size: int, unit: int):
+        """
+        # Arguments
+            batcher: Batcher. Batcher used for predicting action values.
+            size: int. The size of the board.
+            unit: int. Unit value for tile.
+        """
+        super().__init__(batcher)
+        self.size = size
+        self.unit = unit
+
+    def _decode(self, request: Dict) -> State:
+        board = request["board"]
+        if len(board) != self.size or any(len(row) != self.size for row in board):
+            raise ValueError(f"board must be {self.size}x{self.size}")
+        board = [[int(tile) for tile in row] for row in board]
+        # Rejected here, rather than failing the forward pass of the whole batch
+        tiles = {self.unit ** exponent for exponent in range(1, self.size ** 2 + 1)}
+        if any(tile != 0 and tile not in tiles for row in board for tile in row):
+            raise ValueError(f"tiles must be 0 or powers of {self.unit}")
+        return State(board=board, size=self.size, unit=self.unit)
+
+    def _encode(self, values: np.ndarray) -> Dict:
+        return {
+            "direction": Direction(int(values.argmax())).name,
+            "values": [float(value) for value in values],
+        }
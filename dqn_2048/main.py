@@ -3,99 +3,163 @@ Main
 """
 
 import os
-from pathlib import Path
 from sys import argv, stdout
 
-import tensorflow as tf
-from tensorflow.keras import Model
-from tensorflow.keras.layers import Dense
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.optimizers import Adam
-
-from game import Direction, StateBuilder, Environment, QualityBuilder, Agent
-
-CURRENT_PATH = Path(__file__).parent
-
-BOARD_SIZE = 4
-BOARD_UNIT = 2
-
-GAMMA = 0.99
-
-BATCH_SIZE = TRANSITIONS_COUNT = WARMUP_STEPS_COUNT = 5000
-TARGET_SYNCING_FREQUENCY = 500
-EPSILON_START = 1.0
-EPSILON_END = 0.02
-EPSILON_DECAY_STEPS = 100000
-
-STEPS_COUNT = 2000000
-PLAY_EPISODES_COUNT = 10
+from config import (
+    RESULT_PATH, BOARD_SIZE, BOARD_UNIT, LEARNER_WORKERS_COUNT,
+    BATCH_SIZE, TRANSITIONS_COUNT, WARMUP_STEPS_COUNT, TARGET_SYNCING_FREQUENCY,
+    EPSILON_START, EPSILON_END, EPSILON_DECAY_STEPS, PREFETCH_DEPTH,
+    LEARNING_FREQUENCY, GRADIENT_STEPS_COUNT, REPLAY_RATIO,
+    STEPS_COUNT, PLAY_EPISODES_COUNT, LOG_FREQUENCY, RECORDING_PATH,
+    MEMORY_REPORT_FREQUENCY, IS_TRACING_MEMORY, THREADS_COUNT,
+    GAMMA, QUALITY_BACKEND, TUPLES, TUPLE_LEARNING_RATE,
+    BANKED_START_RATE, BANK_CAPACITY, BANK_MIN_TILE, WARMUP_PATH, WARMUP_SEED
+)
+from game import Direction, StateBuilder, Environment, Agent, Recorder, TupleQualityBuilder
+from game import PositionBank, Warmup
+from game.base import Logger, Throughput, RunningAggregate, Histogram
+from game.base import start_tracing, top_allocations
 
 if len(argv) < 2:
     print("Usage: python main.py <gpu_id>")
     exit()
 gpu_id = argv[1]
 
-os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
-physical_devices = tf.config.experimental.list_physical_devices("GPU")
-tf.config.experimental.set_memory_growth(physical_devices[0], True)
-
-def model_builder(output_size: int) -> Model:
-    """
-    # Arguments
-        output_size: int. Output size.
-    # Returns the model.
-    """
-    model = Sequential()
-    model.add(Dense(1024, activation="relu", input_shape=(BOARD_SIZE ** 2,)))
-    model.add(Dense(512, activation="relu"))
-    model.add(Dense(256, activation="relu"))
-    model.add(Dense(output_size))
-    model.compile("sgd", loss="mse")
-    return model
-
 state_builder = StateBuilder().set_size(BOARD_SIZE).set_unit(BOARD_UNIT)
 environment = Environment(state_builder)
+bank = None
+if BANKED_START_RATE > 0:
+    # Filled by both training and evaluation, only training starts from banked positions
+    bank = PositionBank(BANK_CAPACITY, BOARD_SIZE, BOARD_UNIT, BANK_MIN_TILE)
+    environment.set_bank(bank, BANKED_START_RATE)
 
-quality_builder = QualityBuilder() \
-    .set_gamma(GAMMA) \
-    .set_output_size(len(Direction)) \
-    .set_model_builder(model_builder) \
-    .set_optimizer(Adam(lr=1e-4))
+if QUALITY_BACKEND == "tuples":
+    # Pure NumPy, TensorFlow is never imported
+    quality_builder = TupleQualityBuilder() \
+        .set_gamma(GAMMA) \
+        .set_output_size(len(Direction)) \
+        .set_size(BOARD_SIZE) \
+        .set_tuples(TUPLES) \
+        .set_learning_rate(TUPLE_LEARNING_RATE)
+else:
+    from model import select_gpu, limit_threads, create_quality_builder
+    select_gpu(gpu_id)
+    if THREADS_COUNT is not None:
+        limit_threads(THREADS_COUNT)
+    quality_builder = create_quality_builder(LEARNER_WORKERS_COUNT)
 agent = Agent(
     quality_builder,
     BATCH_SIZE, TRANSITIONS_COUNT, WARMUP_STEPS_COUNT, TARGET_SYNCING_FREQUENCY
 )
 agent.set_epsilons(EPSILON_START, EPSILON_END, EPSILON_DECAY_STEPS)
+if WARMUP_PATH is not None:
+    warmup = Warmup(str(WARMUP_PATH), BOARD_SIZE, BOARD_UNIT, WARMUP_SEED)
+    agent.warm_up(warmup.transitions(WARMUP_STEPS_COUNT))
+agent.set_prefetching(PREFETCH_DEPTH)
+agent.set_schedule(LEARNING_FREQUENCY, GRADIENT_STEPS_COUNT)
+if REPLAY_RATIO is not None:
+    agent.start_learning(REPLAY_RATIO)
+playing_recorder = None
+if RECORDING_PATH is not None:
+    agent.set_recorder(Recorder(os.path.join(RECORDING_PATH, "observed"), BOARD_UNIT))
+    playing_recorder = Recorder(os.path.join(RECORDING_PATH, "played"), BOARD_UNIT)
 
-result_path = os.path.join(CURRENT_PATH, "result")
+def evaluate(step: int):
+    """
+    Plays evaluation episodes then writes their results.
+    # Arguments
+        step: int. Current step.
+    """
+    rewards = RunningAggregate()
+    lengths = RunningAggregate()
+    tiles = Histogram()
+    best_reward = 0
+    best_state = None
+    for _ in range(PLAY_EPISODES_COUNT):
+        playing_environment = Environment(state_builder)
+        if bank is not None:
+            playing_environment.set_bank(bank)
+        last_state, transitions_count, reward = agent.play(playing_environment, playing_recorder)
+        rewards.add(reward)
+        lengths.add(transitions_count)
+        episode_lengths.add(transitions_count)
+        tiles.add(last_state.max_tile)
+        if best_state is None or best_reward < reward:
+            best_reward = reward
+            best_state = last_state
+    max_tiles.merge(tiles)
+    logger.write("evaluation", {
+        "step": step,
+        "reward": rewards.summary(),
+        "episode_length": lengths.summary(),
+        "max_tile": tiles.summary(),
+        "best_board": best_state.board,
+        "running": {
+            "episode_length": episode_lengths.summary(),
+            "max_tile": {f"p{q * 100:g}": max_tiles.quantile(q) for q in (0.5, 0.9, 0.99)},
+        },
+    })
+
+def report_memory(step: int):
+    """
+    Writes the memory footprint of the agent and of the process.
+    # Arguments
+        step: int. Current step.
+    """
+    logger.write("memory", {
+        "step": step,
+        **agent.memory(),
+        "bank_bytes": bank.nbytes if bank is not None else 0,
+        "top_allocations": top_allocations(),
+    })
+
+result_path = str(RESULT_PATH)
 os.makedirs(result_path, exist_ok=True)
-with open(os.path.join(result_path, "log.txt"), "w+") as log_file:
-    for step in range(STEPS_COUNT):
-        if step % 100 == 0:
-            stdout.write(f"STEP: {step}\n")
-            stdout.flush()
+# Aggregates over all evaluations, with bounded memory
+episode_lengths = RunningAggregate()
+max_tiles = Histogram()
+if IS_TRACING_MEMORY:
+    start_tracing()
+with Logger(os.path.join(result_path, "metrics.jsonl")) as logger:
+    steps_throughput = Throughput()
+    updates_throughput = Throughput()
+    for step in range(agent.step, STEPS_COUNT):
         # Evaluate before observing next state
         if step % TARGET_SYNCING_FREQUENCY == 0 and step >= WARMUP_STEPS_COUNT:
-            stdout.write("Evaluating\n")
-            stdout.flush()
-            total_reward = 0
-            best_reward = 0
-            best_state = None
-            for _ in range(PLAY_EPISODES_COUNT):
-                last_state, _, reward = agent.play(Environment(state_builder))
-                total_reward += reward
-                if best_reward < reward:
-                    best_reward = reward
-                    best_state = last_state
-            log_file.write("\n".join([
-                f"STEP: {step}. Average reward: {(total_reward / PLAY_EPISODES_COUNT):2}",
-                f"Achieved reward of best episode: {best_reward}",
-                str(best_state)
-            ]) + "\n" * 2)
-            log_file.flush()
+            evaluate(step)
             if step > 0:
                 agent.save(result_path)
-        if step == WARMUP_STEPS_COUNT:
-            log_file.write("START TRAINING\n\n")
-            log_file.flush()
+        if step % MEMORY_REPORT_FREQUENCY == 0:
+            report_memory(step)
         agent.observe(environment)
+        if (step + 1) % LOG_FREQUENCY == 0:
+            losses = agent.collected_losses()
+            record = {
+                "step": agent.step,
+                "steps_per_second": steps_throughput.measure(agent.step),
+                "updates_per_second": updates_throughput.measure(agent.updates_count),
+                "updates": agent.updates_count,
+                "loss": losses.mean if losses.count > 0 else None,
+                "epsilon": agent.epsilon,
+                "transitions": agent.transitions_count,
+                "target_cache": {
+                    "hits": agent.target_hits_count,
+                    "misses": agent.target_misses_count,
+                },
+            }
+            if agent.prefetcher is not None:
+                record["prefetching"] = agent.prefetcher.statistics
+            if bank is not None:
+                record["banked"] = len(bank)
+            logger.write("training", record)
+            stdout.write(
+                f"STEP: {record['step']}. {record['steps_per_second']:.1f} steps/s, "
+                f"{record['updates_per_second']:.2f} updates/s, loss: {record['loss']}\n"
+            )
+            stdout.flush()
+agent.stop_learning()
+if agent.prefetcher is not None:
+    agent.prefetcher.stop()
+if RECORDING_PATH is not None:
+    agent.recorder.close()
+    playing_recorder.close()
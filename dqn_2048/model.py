@@ -0,0 +1,101 @@
+"""
+Model
+"""
+
+import os
+
+import tensorflow as tf
+from tensorflow.keras import Model
+from tensorflow.keras.layers import Dense
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.optimizers import Adam
+
+from config import (
+    BOARD_SIZE, GAMMA, LEARNING_RATE, LAYER_SIZES, FIT_BATCH_SIZE, MICRO_BATCH_SIZE, PRECISION
+)
+from game import Direction, QualityBuilder
+
+# Logical devices can only be configured once per process, so is the strategy using them
+_strategy: tf.distribute.Strategy = None
+
+def select_gpu(gpu_id: str):
+    """
+    # Arguments
+        gpu_id: str. Id of the visible GPU, an empty string hides all GPUs.
+    """
+    os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
+    physical_devices = tf.config.experimental.list_physical_devices("GPU")
+    if physical_devices:
+        tf.config.experimental.set_memory_growth(physical_devices[0], True)
+
+def limit_threads(threads_count: int):
+    """
+    Must be called before TensorFlow initializes its devices.
+    # Arguments
+        threads_count: int. The number of math threads.
+    """
+    tf.config.threading.set_intra_op_parallelism_threads(threads_count)
+    tf.config.threading.set_inter_op_parallelism_threads(threads_count)
+
+def create_strategy(workers_count: int) -> tf.distribute.Strategy:
+    """
+    Splits the CPU into local workers, each one computing the gradients of a shard of every
+        gradient step, which are all-reduced before a single consistent update.
+    Must be called before TensorFlow initializes its devices.
+    The strategy is created once, then returned again by every following call.
+    # Arguments
+        workers_count: int. The number of workers.
+    # Returns the data-parallel strategy.
+    """
+    global _strategy # pylint: disable=global-statement
+    if _strategy is not None:
+        if _strategy.num_replicas_in_sync != workers_count:
+            raise ValueError(
+                f"devices are already configured for {_strategy.num_replicas_in_sync} workers"
+            )
+        return _strategy
+    cpu = tf.config.list_physical_devices("CPU")[0]
+    tf.config.set_logical_device_configuration(
+        cpu, [tf.config.LogicalDeviceConfiguration() for _ in range(workers_count)]
+    )
+    tf.config.threading.set_inter_op_parallelism_threads(workers_count)
+    devices = [device.name for device in tf.config.list_logical_devices("CPU")]
+    _strategy = tf.distribute.MirroredStrategy(
+        devices, cross_device_ops=tf.distribute.ReductionToOneDevice(reduce_to_device=devices[0])
+    )
+    return _strategy
+
+def model_builder(output_size: int) -> Model:
+    """
+    # Arguments
+        output_size: int. Output size.
+    # Returns the model.
+    """
+    model = Sequential()
+    model.add(Dense(LAYER_SIZES[0], activation="relu", input_shape=(BOARD_SIZE ** 2,)))
+    for layer_size in LAYER_SIZES[1:]:
+        model.add(Dense(layer_size, activation="relu"))
+    # Kept in float32 under mixed precision, so are the action values and their gradients
+    model.add(Dense(output_size, dtype="float32"))
+    model.compile("sgd", loss="mse")
+    return model
+
+def create_quality_builder(workers_count: int = 1) -> QualityBuilder:
+    """
+    # Arguments
+        workers_count: int. The number of local data-parallel learner workers.
+    # Returns the quality builder used for training and serving.
+    """
+    # Created first, since the optimizer may initialize the devices
+    strategy = create_strategy(workers_count) if workers_count > 1 else None
+    quality_builder = QualityBuilder() \
+        .set_gamma(GAMMA) \
+        .set_output_size(len(Direction)) \
+        .set_model_builder(model_builder) \
+        .set_optimizer(Adam(learning_rate=LEARNING_RATE)) \
+        .set_fit_batch_size(FIT_BATCH_SIZE) \
+        .set_micro_batch_size(MICRO_BATCH_SIZE) \
+        .set_precision(PRECISION)
+    if strategy is not None:
+        quality_builder.set_strategy(strategy)
+    return quality_builder
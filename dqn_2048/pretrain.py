@@ -0,0 +1,58 @@
+"""
+Pretrain. Trains the quality model offline from transitions recorded by `Recorder`,
+e.g. from past training runs or from expert play.
+Usage: python pretrain.py <gpu_id> <recording_path> [--epochs 1] [--resume]
+"""
+
+import os
+from argparse import ArgumentParser
+
+from config import RESULT_PATH, BOARD_UNIT, BATCH_SIZE, TARGET_SYNCING_FREQUENCY, LOG_FREQUENCY
+from game import Reader
+from game.base import Experience, Logger, Throughput, RunningAggregate
+from model import select_gpu, create_quality_builder
+
+def main():
+    parser = ArgumentParser(description="Train the quality model from recorded transitions")
+    parser.add_argument("gpu_id", help="Id of the visible GPU, empty string to run on CPU")
+    parser.add_argument("recording_path", help="Directory of the recorded chunks")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--shuffle-size", type=int, default=200000)
+    parser.add_argument("--result-path", default=str(RESULT_PATH), help="Checkpoint directory")
+    parser.add_argument("--resume", action="store_true", help="Fine-tune the saved checkpoint")
+    args = parser.parse_args()
+    select_gpu(args.gpu_id)
+
+    quality_builder = create_quality_builder()
+    training_quality = quality_builder.build()
+    target_quality = quality_builder.build()
+    if args.resume:
+        training_quality.load(args.result_path)
+    reader = Reader(args.recording_path, BATCH_SIZE, args.shuffle_size)
+    print(f"Transitions: {reader.transitions_count}")
+
+    os.makedirs(args.result_path, exist_ok=True)
+    with Logger(os.path.join(args.result_path, "pretraining.jsonl")) as logger:
+        throughput = Throughput()
+        losses = RunningAggregate()
+        batches = reader.transition_batches(BOARD_UNIT, args.epochs)
+        for update, transitions in enumerate(batches):
+            if update % TARGET_SYNCING_FREQUENCY == 0:
+                target_quality.copied(training_quality)
+            values = target_quality.calculate(transitions)
+            batch = [Experience(t.old_state, t.action, v) for t, v in zip(transitions, values)]
+            losses.add(training_quality.learn(batch))
+            if (update + 1) % LOG_FREQUENCY == 0:
+                record = {
+                    "updates": update + 1,
+                    "updates_per_second": throughput.measure(update + 1),
+                    "loss": losses.mean,
+                }
+                logger.write("pretraining", record)
+                print(f"UPDATE: {update + 1}. loss: {losses.mean}")
+                losses = RunningAggregate()
+                training_quality.save(args.result_path)
+    training_quality.save(args.result_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Quantize. Exports the saved checkpoint to float16 and int8 (per-channel) weights,
+then checks how often their greedy actions agree with the float32 model
+and compares the boards evaluated per second of the Keras model, of the NumPy float32 reference
+and of the NumPy paths computing in float16 and in int8, all on the same recorded boards.
+Usage: python quantize.py [--games 20] [--output result/quantization.json]
+"""
+
+import json
+import os
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Dict, List
+
+import numpy as np
+
+from config import RESULT_PATH, BOARD_SIZE, BOARD_UNIT, GAMMA
+from game import Direction, StateBuilder, State
+from game.base import InferenceQuality, Evaluator
+from game.game_2048 import QuantizedQuality
+from model import select_gpu, create_quality_builder
+
+def measure_throughput(quality: InferenceQuality, states: List[State], batch_size: int) -> float:
+    """
+    # Arguments
+        quality: InferenceQuality. Quality to be measured.
+        states: List[State]. States to be evaluated.
+        batch_size: int. The number of states per forward pass.
+    # Returns the evaluated states per second.
+    """
+    # Small batches are slow with Keras, so they are measured on fewer states
+    states = states[:batch_size * 64]
+    quality.evaluate(states[:batch_size]) # Warm up
+    started = perf_counter()
+    for i in range(0, len(states), batch_size):
+        quality.evaluate(states[i:i + batch_size])
+    return len(states) / (perf_counter() - started)
+
+def compare(reference: np.ndarray, values: np.ndarray) -> Dict:
+    """
+    # Arguments
+        reference: np.ndarray. Action values of the float32 model.
+        values: np.ndarray. Action values of the quantized model.
+    # Returns the greedy action agreement and the value errors.
+    """
+    errors = np.abs(reference - values)
+    return {
+        "agreement": float((reference.argmax(axis=1) == values.argmax(axis=1)).mean()),
+        "max_abs_error": float(errors.max()),
+        "mean_abs_error": float(errors.mean()),
+    }
+
+def main():
+    parser = ArgumentParser(description="Quantize the saved checkpoint for CPU play")
+    parser.add_argument("--games", type=int, default=20, help="Games played to record boards")
+    parser.add_argument("--throughput-states", type=int, default=4096)
+    parser.add_argument("--result-path", default=str(RESULT_PATH), help="Checkpoint directory")
+    parser.add_argument("--output", default=None, help="Path of the JSON report")
+    args = parser.parse_args()
+    select_gpu("")
+
+    quality = create_quality_builder().build()
+    quality.load(args.result_path)
+    # Record the boards met by the float32 model playing greedily
+    states = []
+    state_builder = StateBuilder().set_size(BOARD_SIZE).set_unit(BOARD_UNIT)
+    Evaluator(quality, state_builder, batch_size=args.games).play(args.games, states)
+    reference = quality.evaluate(states)
+    throughput_states = (states * (args.throughput_states // len(states) + 1))
+    throughput_states = throughput_states[:args.throughput_states]
+
+    report = {"boards": len(states), "qualities": {}}
+    qualities = {"keras float32": quality}
+    for precision in QuantizedQuality.PRECISIONS:
+        quantized_quality = QuantizedQuality(GAMMA, len(Direction), precision)
+        quantized_quality.copied(quality)
+        quantized_quality.save(args.result_path)
+        qualities[f"numpy {precision}"] = quantized_quality
+        report["qualities"][f"numpy {precision}"] = {
+            "bytes": quantized_quality.nbytes,
+            **compare(reference, quantized_quality.evaluate(states)),
+        }
+    report["qualities"]["keras float32"] = {
+        "bytes": sum(weights.nbytes for weights in quality.weights)
+    }
+    for name, measured_quality in qualities.items():
+        report["qualities"][name]["states_per_second"] = {
+            str(batch_size): measure_throughput(measured_quality, throughput_states, batch_size)
+            for batch_size in (1, 32, 256)
+        }
+    print(json.dumps(report, indent=2))
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    print(f"Quantized weights saved to {os.path.abspath(args.result_path)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Serve. Recommends moves of the trained agent to concurrent game clients.
+Usage: python serve.py <gpu_id> [--port PORT | --path SOCKET_PATH]
+"""
+
+import asyncio
+from argparse import ArgumentParser
+
+from config import RESULT_PATH, BOARD_SIZE, BOARD_UNIT
+from game.base import Batcher
+from game import Server
+from model import select_gpu, create_quality_builder
+
+parser = ArgumentParser(description="Serve the trained agent")
+parser.add_argument("gpu_id", help="Id of the visible GPU, empty string to run on CPU")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8048)
+parser.add_argument("--path", default=None, help="Unix socket path, used instead of host and port")
+parser.add_argument("--result-path", default=str(RESULT_PATH), help="Directory of the checkpoint")
+parser.add_argument("--max-batch-size", type=int, default=256)
+parser.add_argument("--max-wait-time", type=float, default=2.0, help="In milliseconds")
+args = parser.parse_args()
+
+select_gpu(args.gpu_id)
+
+quality = create_quality_builder().build()
+quality.load(args.result_path)
+batcher = Batcher(quality, args.max_batch_size, args.max_wait_time / 1000)
+server = Server(batcher, BOARD_SIZE, BOARD_UNIT)
+
+print(f"Serving on {args.path or f'{args.host}:{args.port}'}")
+try:
+    asyncio.run(server.serve(host=args.host, port=args.port, path=args.path))
+except KeyboardInterrupt:
+    pass
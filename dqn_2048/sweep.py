@@ -0,0 +1,239 @@
+"""
+Sweep. Runs many short trainings concurrently over a grid or random search space,
+stopping underperformers early with asynchronous successive halving.
+Each trial is `main.py` with some constants of `config.py` overridden.
+Usage: python sweep.py <space.json> [--mode grid|random] [--trials 32] [--workers 4]
+# Examples
+    space.json:
+        {
+            "GAMMA": [0.95, 0.99],
+            "LEARNING_RATE": {"log_uniform": [1e-5, 1e-3]},
+            "TARGET_SYNCING_FREQUENCY": {"int_uniform": [250, 2000]},
+            "LAYER_SIZES": [[256, 256], [1024, 512, 256]]
+        }
+"""
+
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from itertools import product
+from math import exp, log
+from pathlib import Path
+from random import Random
+from time import sleep
+from typing import Dict, List
+
+from config import CURRENT_PATH, RESULT_PATH
+
+class Trial:
+    """
+    Trial. One training run of the sweep.
+    """
+
+    def __init__(self, index: int, overrides: Dict, result_path: Path):
+        """
+        # Arguments
+            index: int. Index of the trial.
+            overrides: Dict. Overridden constants of `config.py`.
+            result_path: Path. Directory of the trial's checkpoint and metrics.
+        """
+        self.index = index
+        self.overrides = overrides
+        self.result_path = result_path
+        self.status = "pending"
+        self.step = 0
+        self.score = None
+        self.best_score = None
+        # Score at each rung reached, by rung index
+        self.rung_scores: Dict[int, float] = {}
+        self._process: subprocess.Popen = None
+        self._metrics_offset = 0
+
+    def start(self, steps_count: int, threads_count: int):
+        """
+        # Arguments
+            steps_count: int. The maximum number of steps of the training.
+            threads_count: int. The number of math threads of the training.
+        """
+        self.result_path.mkdir(parents=True, exist_ok=True)
+        overrides = {
+            **self.overrides,
+            "RESULT_PATH": str(self.result_path),
+            "STEPS_COUNT": steps_count,
+            "THREADS_COUNT": threads_count,
+        }
+        environment = {
+            **os.environ,
+            "DQN_2048_CONFIG": json.dumps(overrides),
+            "OMP_NUM_THREADS": str(threads_count),
+        }
+        with open(self.result_path / "output.txt", "w") as output_file:
+            self._process = subprocess.Popen(
+                [sys.executable, str(CURRENT_PATH / "main.py"), ""],
+                env=environment, stdout=output_file, stderr=subprocess.STDOUT
+            )
+        self.status = "running"
+
+    def stop(self):
+        """
+        Stops the training early.
+        """
+        self._process.terminate()
+        self._process.wait()
+        self.status = "stopped"
+
+    def poll(self) -> bool:
+        """
+        Reads the evaluations written since the last poll.
+        # Returns a flag indicates whether the training is still running.
+        """
+        metrics_path = self.result_path / "metrics.jsonl"
+        if metrics_path.exists():
+            with open(metrics_path) as metrics_file:
+                metrics_file.seek(self._metrics_offset)
+                for line in metrics_file:
+                    if not line.endswith("\n"):
+                        break # Partially flushed line, read it next time
+                    self._metrics_offset += len(line)
+                    record = json.loads(line)
+                    if record["kind"] == "evaluation":
+                        self.step = record["step"]
+                        self.score = record["reward"]["mean"]
+                        self.best_score = max(self.best_score or self.score, self.score)
+        if self._process.poll() is None:
+            return True
+        self.status = "completed" if self._process.returncode == 0 else "failed"
+        return False
+
+    def report(self) -> Dict:
+        """
+        # Returns the summary of the trial.
+        """
+        return {
+            "index": self.index,
+            "overrides": self.overrides,
+            "status": self.status,
+            "step": self.step,
+            "score": self.score,
+            "best_score": self.best_score,
+            "rung_scores": self.rung_scores,
+        }
+
+def create_overrides(space: Dict, mode: str, trials_count: int, seed: int) -> List[Dict]:
+    """
+    # Arguments
+        space: Dict. Values of each constant, either a list of choices,
+            or {"uniform": [a, b]}, {"log_uniform": [a, b]}, {"int_uniform": [a, b]}.
+        mode: str. "grid" for every combination of choices, "random" for sampled values.
+        trials_count: int. The number of sampled trials in random mode.
+        seed: int. Seed of the random search.
+    # Returns the overridden constants of each trial.
+    """
+    if mode == "grid":
+        if any(not isinstance(values, list) for values in space.values()):
+            raise ValueError("Grid search needs a list of choices for every constant")
+        return [dict(zip(space, values)) for values in product(*space.values())]
+    random = Random(seed)
+    def draw(values):
+        if isinstance(values, list):
+            return random.choice(values)
+        (kind, (low, high)), = values.items()
+        if kind == "uniform":
+            return random.uniform(low, high)
+        if kind == "log_uniform":
+            return exp(random.uniform(log(low), log(high)))
+        if kind == "int_uniform":
+            return random.randint(low, high)
+        raise ValueError(f"Unknown distribution: {kind}")
+    return [{name: draw(values) for name, values in space.items()} for _ in range(trials_count)]
+
+def create_rungs(min_steps_count: int, max_steps_count: int, eta: int) -> List[int]:
+    """
+    # Returns the steps at which trials are compared, growing geometrically.
+    """
+    rungs = []
+    steps_count = min_steps_count
+    while steps_count < max_steps_count:
+        rungs.append(steps_count)
+        steps_count *= eta
+    return rungs
+
+def is_promoted(trial: Trial, rung: int, trials: List[Trial], eta: int) -> bool:
+    """
+    Asynchronous successive halving: a trial goes on past a rung only if its score is
+        among the best `1 / eta` of all scores recorded at that rung so far.
+    # Returns a flag indicates whether the trial keeps running.
+    """
+    scores = sorted(
+        (t.rung_scores[rung] for t in trials if rung in t.rung_scores), reverse=True
+    )
+    kept_count = max(1, len(scores) // eta)
+    return trial.rung_scores[rung] >= scores[kept_count - 1]
+
+def main():
+    parser = ArgumentParser(description="Hyperparameter sweep with successive halving")
+    parser.add_argument("space_path", help="JSON file of the search space")
+    parser.add_argument("--mode", choices=["grid", "random"], default="random")
+    parser.add_argument("--trials", type=int, default=32, help="Trials of random search")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent trials")
+    parser.add_argument("--threads-per-trial", type=int, default=max(1, os.cpu_count() // 4))
+    parser.add_argument("--min-steps", type=int, default=20000, help="First rung")
+    parser.add_argument("--max-steps", type=int, default=200000, help="Steps of full trials")
+    parser.add_argument("--eta", type=int, default=3, help="Halving rate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--poll-interval", type=float, default=10.0, help="In seconds")
+    parser.add_argument("--output", default=str(RESULT_PATH / "sweep"), help="Sweep directory")
+    args = parser.parse_args()
+
+    with open(args.space_path) as space_file:
+        space = json.load(space_file)
+    output_path = Path(args.output).absolute()
+    trials = [
+        Trial(i, overrides, output_path / f"trial_{i:04d}")
+        for i, overrides in enumerate(create_overrides(space, args.mode, args.trials, args.seed))
+    ]
+    rungs = create_rungs(args.min_steps, args.max_steps, args.eta)
+    print(f"{len(trials)} trials, rungs at steps {rungs}")
+
+    pending_trials = list(trials)
+    running_trials: List[Trial] = []
+    try:
+        while pending_trials or running_trials:
+            while pending_trials and len(running_trials) < args.workers:
+                trial = pending_trials.pop(0)
+                trial.start(args.max_steps, args.threads_per_trial)
+                running_trials.append(trial)
+            sleep(args.poll_interval)
+            for trial in list(running_trials):
+                if not trial.poll():
+                    running_trials.remove(trial)
+                    print(f"Trial {trial.index} {trial.status}, score {trial.score}")
+                    continue
+                for rung_index, rung in enumerate(rungs):
+                    if rung_index in trial.rung_scores or trial.step < rung:
+                        continue
+                    trial.rung_scores[rung_index] = trial.score
+                    if not is_promoted(trial, rung_index, trials, args.eta):
+                        trial.stop()
+                        running_trials.remove(trial)
+                        print(f"Trial {trial.index} stopped at step {trial.step}, "
+                              f"score {trial.score}")
+                        break
+    finally:
+        for trial in running_trials:
+            trial.stop()
+        reports = sorted(
+            (trial.report() for trial in trials),
+            key=lambda report: (report["best_score"] is not None, report["best_score"] or 0),
+            reverse=True
+        )
+        output_path.mkdir(parents=True, exist_ok=True)
+        with open(output_path / "sweep.json", "w") as sweep_file:
+            json.dump(reports, sweep_file, indent=2)
+    for report in reports[:10]:
+        print(f"{report['best_score']}\t{report['status']}\t{json.dumps(report['overrides'])}")
+
+if __name__ == "__main__":
+    main()